@@ -1,6 +1,7 @@
 from typing import Any
 
 from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import load_settings
@@ -17,6 +18,8 @@ REQUIRED_EVENT_FIELDS = ("event_id", "event_type", "event_ts", "user_id", "sessi
 
 settings = load_settings()
 app = FastAPI(title="Neurogame Events API", version="0.1.0")
+# Сжимаем только ответы клиентам с Accept-Encoding: gzip; короткие ответы телеметрии не трогаем.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 def _require_api_key(body: dict[str, Any]) -> None:
@@ -18,6 +18,7 @@ class RLAgent:
     )
     state_mean: tuple[float, ...] | None = None
     state_std: tuple[float, ...] | None = None
+    quantization: str = "none"
     last_task_deltas: dict[str, int] | None = None
     state_dim: Optional[int] = None
     model: Optional[Any] = None
@@ -91,10 +92,14 @@ class RLAgent:
                     if len(state_mean) == len(state_std):
                         self.state_mean = tuple(float(x) for x in state_mean)
                         self.state_std = tuple(max(float(x), 1e-6) for x in state_std)
+                self.quantization = str(meta.get("quantization", "none")).strip() or "none"
             except Exception:
                 pass
         self.state_dim = state_dim
         self.model = ActorCritic(state_dim, self.action_dim)
+        if self.quantization == "dynamic_int8":
+            # Упакованные int8-веса загружаются только в такую же квантованную структуру.
+            self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
         self.model.load_state_dict(torch.load(self.model_path, map_location="cpu"))
         self.model.eval()
         self.available = True
@@ -1,5 +1,7 @@
+import bisect
 import random
-from typing import List, Optional
+from itertools import accumulate
+from typing import List, Optional, Tuple
 
 from game.settings import DifficultyConfig
 from game.runtime.models import TaskResult, TaskSpec
@@ -26,6 +28,14 @@ class TaskManager:
         self.tasks_completed: int = 0
         self.current_rule: str = "COLOR"
         self.current_level: int = 1
+        self._task_factories = (
+            self._create_compare_codes,
+            self._create_sequence_memory,
+            self._create_rule_switch,
+            self._create_parity_check,
+            self._create_radar_scan,
+        )
+        self._mix_thresholds = self._build_mix_thresholds(difficulty)
 
     def update(self, now_ms: int) -> List[TaskResult]:
         results: List[TaskResult] = []
@@ -82,28 +92,23 @@ class TaskManager:
 
     def set_difficulty(self, difficulty: DifficultyConfig) -> None:
         self.difficulty = difficulty
+        self._mix_thresholds = self._build_mix_thresholds(difficulty)
 
     def set_level(self, level: int) -> None:
         self.current_level = level
 
-    def _create_task(self, now_ms: int) -> TaskBase:
-        mix = self.difficulty.global_params.task_mix
+    @staticmethod
+    def _build_mix_thresholds(difficulty: DifficultyConfig) -> Tuple[float, ...]:
+        # Накопленные вероятности compare / memory / switch / parity; остаток уходит в radar.
+        mix = difficulty.global_params.task_mix
         total = sum(mix) if mix else 1.0
+        shares = [mix[i] / total if len(mix) > i else 0.0 for i in range(4)]
+        return tuple(accumulate(shares))
+
+    def _create_task(self, now_ms: int) -> TaskBase:
         roll = self.rng.random()
-        p_compare = mix[0] / total
-        p_memory = mix[1] / total if len(mix) > 1 else 0.0
-        p_switch = mix[2] / total if len(mix) > 2 else 0.0
-        p_parity = mix[3] / total if len(mix) > 3 else 0.0
-
-        if roll < p_compare:
-            return self._create_compare_codes(now_ms)
-        if roll < p_compare + p_memory:
-            return self._create_sequence_memory(now_ms)
-        if roll < p_compare + p_memory + p_switch:
-            return self._create_rule_switch(now_ms)
-        if roll < p_compare + p_memory + p_switch + p_parity:
-            return self._create_parity_check(now_ms)
-        return self._create_radar_scan(now_ms)
+        index = bisect.bisect_right(self._mix_thresholds, roll)
+        return self._task_factories[index](now_ms)
 
     def _create_compare_codes(self, now_ms: int) -> TaskBase:
         diff = self.difficulty.compare
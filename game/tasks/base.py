@@ -93,16 +93,20 @@ def wrap_text(
     if not words:
         return [""]
 
-    lines: list[str] = []
-    current = ""
+    # Ширину меряем по словам один раз и складываем, а не перемеряем растущую строку.
     safe_width = max(24, int(max_width))
-    for word in words:
-        candidate = f"{current} {word}".strip()
-        if not current or font.size(candidate)[0] <= safe_width:
-            current = candidate
+    space_width = font.size(" ")[0]
+    lines: list[str] = []
+    current = [words[0]]
+    current_width = font.size(words[0])[0]
+    for word in words[1:]:
+        word_width = font.size(word)[0]
+        if current_width + space_width + word_width <= safe_width:
+            current.append(word)
+            current_width += space_width + word_width
             continue
-        lines.append(current)
-        current = word
-    if current:
-        lines.append(current)
+        lines.append(" ".join(current))
+        current = [word]
+        current_width = word_width
+    lines.append(" ".join(current))
     return lines
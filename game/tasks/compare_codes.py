@@ -8,17 +8,33 @@ from game.tasks.base import TaskBase, TaskRenderContext, render_fitted_text
 from game.tasks.input_utils import read_left_right_key
 
 
+_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+_ALPHA_BYTES = _ALPHABET.encode("ascii")
+# Для каждого символа заранее готовим алфавит без него (35 вариантов замены).
+_ALPHABET_MINUS = {ch: _ALPHABET.replace(ch, "") for ch in _ALPHABET}
+
+
 def _build_code(rng: random.Random, length: int) -> str:
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    return "".join(rng.choice(alphabet) for _ in range(length))
+    # 6 случайных бит дают 0..63; значения >= 36 отбрасываем (принимается ~56% выборок).
+    getrandbits = rng.getrandbits
+    buf = bytearray(length)
+    i = 0
+    while i < length:
+        v = getrandbits(6)
+        if v < 36:
+            buf[i] = _ALPHA_BYTES[v]
+            i += 1
+    return buf.decode("ascii")
 
 
 def _make_pair(rng: random.Random, length: int, similarity_rate: float) -> Tuple[str, str, bool]:
     code_a = _build_code(rng, length)
     if rng.random() < similarity_rate:
         index = rng.randrange(length)
-        char_options = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789".replace(code_a[index], "")
-        code_b = code_a[:index] + rng.choice(char_options) + code_a[index + 1 :]
+        repl = rng.choice(_ALPHABET_MINUS[code_a[index]])
+        buf = bytearray(code_a, "ascii")
+        buf[index] = ord(repl)
+        code_b = buf.decode("ascii")
         return code_a, code_b, False
     return code_a, code_a, True
 
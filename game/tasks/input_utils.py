@@ -6,17 +6,14 @@ RIGHT_KEYS = {pygame.K_j, pygame.K_o}
 LEFT_CHARS = {"f", "a", "а"}  # латиница/кириллица
 RIGHT_CHARS = {"j", "o", "о"}  # латиница/кириллица
 
+_KEY_DIR = {**dict.fromkeys(LEFT_KEYS, "LEFT"), **dict.fromkeys(RIGHT_KEYS, "RIGHT")}
+_CHAR_DIR = {**dict.fromkeys(LEFT_CHARS, "LEFT"), **dict.fromkeys(RIGHT_CHARS, "RIGHT")}
+
 
 def read_left_right_key(event: pygame.event.Event):
     if event.type != pygame.KEYDOWN:
         return None
-    if event.key in LEFT_KEYS:
-        return "LEFT"
-    if event.key in RIGHT_KEYS:
-        return "RIGHT"
-    char = (event.unicode or "").lower()
-    if char in LEFT_CHARS:
-        return "LEFT"
-    if char in RIGHT_CHARS:
-        return "RIGHT"
-    return None
+    direction = _KEY_DIR.get(event.key)
+    if direction is not None:
+        return direction
+    return _CHAR_DIR.get((event.unicode or "").lower())
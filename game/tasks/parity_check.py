@@ -1,4 +1,7 @@
 import random
+from functools import lru_cache, partial
+from math import isqrt
+from typing import Callable, Tuple
 
 import pygame
 
@@ -7,21 +10,158 @@ from game.tasks.base import TaskBase, TaskRenderContext, render_fitted_text, wra
 from game.tasks.input_utils import read_left_right_key
 
 
-def _is_prime(value: int) -> bool:
-    n = abs(value)
+_MR_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_SMALL_PRIMES = frozenset(_MR_WITNESSES)
+
+
+def _is_prime_mr(n: int) -> bool:
+    # Детерминированный Миллер–Рабин: набор свидетелей точен для всех n < 3.3e24.
     if n < 2:
         return False
-    if n == 2:
+    if n in _SMALL_PRIMES:
         return True
     if n % 2 == 0:
         return False
-    limit = int(n**0.5)
-    for div in range(3, limit + 1, 2):
-        if n % div == 0:
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
             return False
     return True
 
 
+def _is_prime(value: int) -> bool:
+    return _is_prime_mr(abs(value))
+
+
+# Решето строится только для диапазонов, где таблица остается компактной.
+_SIEVE_LIMIT = 2_000_000
+
+
+@lru_cache(maxsize=8)
+def _prime_sieve(limit: int) -> bytes:
+    size = max(2, limit) + 1
+    sieve = bytearray([1]) * size
+    sieve[0] = sieve[1] = 0
+    for i in range(2, isqrt(size - 1) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, size, i)))
+    return bytes(sieve)
+
+
+def _in_sieve(sieve: bytes, value: int) -> bool:
+    return sieve[abs(value)] == 1
+
+
+def _is_even(value: int) -> bool:
+    return (value % 2) == 0
+
+
+def _greater_than(threshold: int, value: int) -> bool:
+    return value > threshold
+
+
+def _divisible_by(div: int, value: int) -> bool:
+    return (value % div) == 0
+
+
+def _contains_digit(digit: int, value: int) -> bool:
+    n = abs(value)
+    if n == 0:
+        return digit == 0
+    while n:
+        if n % 10 == digit:
+            return True
+        n //= 10
+    return False
+
+
+def _digit_sum(value: int) -> int:
+    n = abs(value)
+    total = 0
+    while n:
+        total += n % 10
+        n //= 10
+    return total
+
+
+def _digit_sum_even(value: int) -> bool:
+    return (_digit_sum(value) % 2) == 0
+
+
+def _ends_in(allowed: Tuple[int, ...], value: int) -> bool:
+    return abs(value) % 10 in allowed
+
+
+Question = Tuple[str, Callable[[int], bool], str]
+
+
+def _build_even(rng: random.Random, low: int, high: int) -> Question:
+    return "Число четное?", _is_even, "even"
+
+
+def _build_greater_than(rng: random.Random, low: int, high: int) -> Question:
+    threshold = rng.randint(low, high)
+    return f"Число больше {threshold}?", partial(_greater_than, threshold), "greater_than"
+
+
+def _build_divisible(rng: random.Random, low: int, high: int) -> Question:
+    div = rng.choice((3, 5))
+    return f"Число кратно {div}?", partial(_divisible_by, div), "divisible"
+
+
+def _build_prime(rng: random.Random, low: int, high: int) -> Question:
+    limit = max(abs(low), abs(high))
+    if limit <= _SIEVE_LIMIT:
+        return "Число простое?", partial(_in_sieve, _prime_sieve(limit)), "prime"
+    return "Число простое?", _is_prime, "prime"
+
+
+def _build_contains_digit(rng: random.Random, low: int, high: int) -> Question:
+    digit = rng.randint(0, 9)
+    return f"Содержит цифру {digit}?", partial(_contains_digit, digit), "contains_digit"
+
+
+def _build_digit_sum_even(rng: random.Random, low: int, high: int) -> Question:
+    return "Сумма цифр четная?", _digit_sum_even, "digit_sum_even"
+
+
+_ENDINGS = ((1, 3, 7, 9), (0, 2, 4, 6, 8), (0, 5))
+
+
+def _build_ending_in(rng: random.Random, low: int, high: int) -> Question:
+    endings = rng.choice(_ENDINGS)
+    ending_text = ", ".join(str(e) for e in endings)
+    return f"Оканчивается на {ending_text}?", partial(_ends_in, endings), "ending_in"
+
+
+# (минимальная сложность, построитель вопроса)
+_QUESTION_BUILDERS: Tuple[Tuple[int, Callable[[random.Random, int, int], Question]], ...] = (
+    (1, _build_even),
+    (2, _build_greater_than),
+    (3, _build_divisible),
+    (4, _build_prime),
+    (5, _build_contains_digit),
+    (6, _build_digit_sum_even),
+    (7, _build_ending_in),
+)
+
+
+@lru_cache(maxsize=16)
+def _eligible_builders(complexity: int) -> Tuple[int, ...]:
+    return tuple(i for i, (min_complexity, _) in enumerate(_QUESTION_BUILDERS) if complexity >= min_complexity)
+
+
 class ParityCheckTask(TaskBase):
     task_id = "parity_check"
 
@@ -31,53 +171,11 @@ class ParityCheckTask(TaskBase):
         high = spec.difficulty["max_value"]
         complexity = int(spec.difficulty.get("question_complexity", 1))
         self.value = rng.randint(low, high)
+        self._value_str = str(self.value)
 
-        predicates = []
-
-        predicates.append(("Число четное?", lambda v: (v % 2) == 0, "even"))
-
-        if complexity >= 2:
-            threshold = rng.randint(low, high)
-            predicates.append((f"Число больше {threshold}?", lambda v, t=threshold: v > t, "greater_than"))
-
-        if complexity >= 3:
-            div = rng.choice([3, 5])
-            predicates.append((f"Число кратно {div}?", lambda v, d=div: (v % d) == 0, "divisible"))
-
-        if complexity >= 4:
-            predicates.append(("Число простое?", _is_prime, "prime"))
-
-        if complexity >= 5:
-            digit = rng.randint(0, 9)
-            predicates.append(
-                (
-                    f"Содержит цифру {digit}?",
-                    lambda v, d=digit: str(d) in str(abs(v)),
-                    "contains_digit",
-                )
-            )
-
-        if complexity >= 6:
-            predicates.append(
-                (
-                    "Сумма цифр четная?",
-                    lambda v: (sum(int(ch) for ch in str(abs(v))) % 2) == 0,
-                    "digit_sum_even",
-                )
-            )
-
-        if complexity >= 7:
-            endings = rng.choice([(1, 3, 7, 9), (0, 2, 4, 6, 8), (0, 5)])
-            ending_text = ", ".join(str(e) for e in endings)
-            predicates.append(
-                (
-                    f"Оканчивается на {ending_text}?",
-                    lambda v, allowed=endings: abs(v) % 10 in allowed,
-                    "ending_in",
-                )
-            )
-
-        question, fn, question_type = rng.choice(predicates)
+        eligible = _eligible_builders(max(1, min(complexity, len(_QUESTION_BUILDERS))))
+        _, builder = _QUESTION_BUILDERS[eligible[rng.randrange(len(eligible))]]
+        question, fn, question_type = builder(rng, low, high)
         self.question_text = question
         self.answer_is_yes = fn(self.value)
         self.spec.payload["question_type"] = question_type
@@ -100,7 +198,7 @@ class ParityCheckTask(TaskBase):
         max_text_width = ctx.rect.width - 32
         title_lines = wrap_text(self.question_text, ctx.font_small, max_text_width)
         value = render_fitted_text(
-            str(self.value),
+            self._value_str,
             ctx.color_accent,
             [ctx.font_big, ctx.font_mid, ctx.font_small],
             max_text_width,
@@ -9,6 +9,7 @@ from game.tasks.input_utils import read_left_right_key
 
 TARGET_SYMBOLS = ["X", "K", "R", "N", "Z", "M", "V"]
 BASE_ALPHABET = ["A", "C", "D", "E", "G", "H", "J", "L", "P", "Q", "S", "T", "U", "W", "Y"]
+_SIGNAL_ALPHABETS = {sym: tuple(ch for ch in BASE_ALPHABET if ch != sym) for sym in TARGET_SYMBOLS}
 
 
 class RadarScanTask(TaskBase):
@@ -22,14 +23,14 @@ class RadarScanTask(TaskBase):
         pool_size = max(1, min(len(TARGET_SYMBOLS), target_pool_size))
         self.target_symbol = rng.choice(TARGET_SYMBOLS[:pool_size])
 
-        alphabet = [ch for ch in BASE_ALPHABET if ch != self.target_symbol]
-        self.signal = "".join(rng.choice(alphabet) for _ in range(signal_len))
+        chars = rng.choices(_SIGNAL_ALPHABETS[self.target_symbol], k=signal_len)
         self.has_threat = rng.random() < threat_rate
         if self.has_threat:
-            idx = rng.randrange(signal_len)
-            self.signal = self.signal[:idx] + self.target_symbol + self.signal[idx + 1 :]
+            chars[rng.randrange(signal_len)] = self.target_symbol
+        self.signal = "".join(chars)
 
         self.spec.payload["target_symbol"] = self.target_symbol
+        self._sub_text = f"Ищи символ: {self.target_symbol}"
 
     def handle_event(self, event: pygame.event.Event, now_ms: int) -> None:
         if self.finished_ms is not None:
@@ -47,7 +48,7 @@ class RadarScanTask(TaskBase):
         bottom_y = ctx.rect.bottom - 24
         max_text_width = ctx.rect.width - 32
         title_lines = wrap_text("Есть метка угрозы?", ctx.font_small, max_text_width)
-        sub_lines = wrap_text(f"Ищи символ: {self.target_symbol}", ctx.font_small, max_text_width)
+        sub_lines = wrap_text(self._sub_text, ctx.font_small, max_text_width)
         value = render_fitted_text(
             self.signal,
             ctx.color_accent,
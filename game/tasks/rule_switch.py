@@ -1,11 +1,12 @@
 import random
 import math
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import pygame
 
 from game.runtime.models import TaskSpec
-from game.tasks.base import TaskBase, TaskRenderContext
+from game.tasks.base import TaskBase, TaskRenderContext, wrap_text
 from game.tasks.input_utils import read_left_right_key
 
 
@@ -29,15 +30,40 @@ SHAPES: List[Tuple[str, str]] = [
     ("star", "звезда"),
 ]
 
+# Наборы цветов/форм по уровню сложности: срезы не пересоздаются на каждую задачу.
+_ACTIVE_COLORS = {count: tuple(COLORS[:count]) for count in range(2, len(COLORS) + 1)}
+_ACTIVE_SHAPES = {count: tuple(SHAPES[:count]) for count in range(2, len(SHAPES) + 1)}
 
+
+_UP_SHIFT = -math.pi / 2
+_STAR_INNER_SHIFT = _UP_SHIFT + math.pi / 5
+
+
+def _unit_polygon(count: int, angle_shift: float) -> Tuple[Tuple[float, float], ...]:
+    return tuple(
+        (math.cos(angle_shift + math.tau * i / count), math.sin(angle_shift + math.tau * i / count))
+        for i in range(count)
+    )
+
+
+# Единичные вершины для фигур, которые рисуются каждый кадр.
+_UNIT_POLYGONS = {
+    (count, shift): _unit_polygon(count, shift)
+    for count, shift in ((5, _UP_SHIFT), (6, 0.0), (5, _STAR_INNER_SHIFT))
+}
+
+
+@lru_cache(maxsize=64)
 def _polygon_points(cx: int, cy: int, radius: int, count: int, angle_shift: float = 0.0):
-    points = []
-    for i in range(count):
-        angle = angle_shift + (2 * 3.14159265 * i / count)
-        x = int(cx + radius * math.cos(angle))
-        y = int(cy + radius * math.sin(angle))
-        points.append((x, y))
-    return points
+    unit = _UNIT_POLYGONS.get((count, angle_shift)) or _unit_polygon(count, angle_shift)
+    return tuple((int(cx + radius * ux), int(cy + radius * uy)) for ux, uy in unit)
+
+
+@lru_cache(maxsize=64)
+def _star_points(cx: int, cy: int, size: int):
+    outer = _polygon_points(cx, cy, size, 5, _UP_SHIFT)
+    inner = _polygon_points(cx, cy, max(8, size // 2), 5, _STAR_INNER_SHIFT)
+    return tuple(point for pair in zip(outer, inner) for point in pair)
 
 
 def _draw_shape(screen: pygame.Surface, shape: str, color: Tuple[int, int, int], center_x: int, center_y: int, size: int):
@@ -68,19 +94,13 @@ def _draw_shape(screen: pygame.Surface, shape: str, color: Tuple[int, int, int],
         pygame.draw.polygon(screen, color, points)
         return
     if shape == "pentagon":
-        pygame.draw.polygon(screen, color, _polygon_points(center_x, center_y, size, 5, -3.14159265 / 2))
+        pygame.draw.polygon(screen, color, _polygon_points(center_x, center_y, size, 5, _UP_SHIFT))
         return
     if shape == "hexagon":
         pygame.draw.polygon(screen, color, _polygon_points(center_x, center_y, size, 6, 0.0))
         return
     if shape == "star":
-        outer = _polygon_points(center_x, center_y, size, 5, -3.14159265 / 2)
-        inner = _polygon_points(center_x, center_y, max(8, size // 2), 5, -3.14159265 / 2 + 3.14159265 / 5)
-        points = []
-        for i in range(5):
-            points.append(outer[i])
-            points.append(inner[i])
-        pygame.draw.polygon(screen, color, points)
+        pygame.draw.polygon(screen, color, _star_points(center_x, center_y, size))
         return
 
     pygame.draw.circle(screen, color, (center_x, center_y), size)
@@ -97,8 +117,8 @@ class RuleSwitchTask(TaskBase):
         colors_count = max(2, min(len(COLORS), complexity))
         shapes_count = max(2, min(len(SHAPES), complexity))
 
-        active_colors = COLORS[:colors_count]
-        active_shapes = SHAPES[:shapes_count]
+        active_colors = _ACTIVE_COLORS[colors_count]
+        active_shapes = _ACTIVE_SHAPES[shapes_count]
 
         self.color_key, self.color_rgb, self.color_name = rng.choice(active_colors)
         self.shape_key, self.shape_name = rng.choice(active_shapes)
@@ -116,6 +136,8 @@ class RuleSwitchTask(TaskBase):
 
         self.spec.payload["rule"] = self.rule
         self.spec.payload["question_text"] = self.question_text
+        self._wrapped_lines: Optional[List[pygame.Surface]] = None
+        self._wrapped_key: Optional[tuple] = None
 
     def handle_event(self, event: pygame.event.Event, now_ms: int) -> None:
         if self.finished_ms is not None:
@@ -143,21 +165,7 @@ class RuleSwitchTask(TaskBase):
         screen.blit(cue, (x, cursor_y))
         cursor_y += cue.get_height() + 4
 
-        words = self.question_text.split()
-        line = ""
-        question_lines = []
-        for word in words:
-            candidate = f"{line} {word}".strip()
-            if ctx.font_small.size(candidate)[0] <= text_max_w:
-                line = candidate
-            else:
-                if line:
-                    question_lines.append(line)
-                line = word
-        if line:
-            question_lines.append(line)
-        for question_line in question_lines:
-            q = ctx.font_small.render(question_line, True, ctx.color_main)
+        for q in self._question_surfaces(ctx, text_max_w):
             screen.blit(q, (x, cursor_y))
             cursor_y += q.get_height() + 2
         cursor_y += 4
@@ -175,3 +183,13 @@ class RuleSwitchTask(TaskBase):
         _draw_shape(screen, self.shape_key, self.color_rgb, center_x, cy, size)
 
         screen.blit(footer, (x, bottom_y - footer.get_height()))
+
+    def _question_surfaces(self, ctx: TaskRenderContext, text_max_w: int) -> List[pygame.Surface]:
+        # Перенос строк и растеризация выполняются один раз, пока не сменятся ширина, шрифт или цвет.
+        key = (text_max_w, ctx.font_small, ctx.color_main)
+        if self._wrapped_lines is not None and self._wrapped_key == key:
+            return self._wrapped_lines
+        question_lines = wrap_text(self.question_text, ctx.font_small, text_max_w)
+        self._wrapped_lines = [ctx.font_small.render(q, True, ctx.color_main) for q in question_lines]
+        self._wrapped_key = key
+        return self._wrapped_lines
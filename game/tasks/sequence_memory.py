@@ -1,5 +1,4 @@
 import random
-from typing import List
 
 import pygame
 
@@ -8,15 +7,22 @@ from game.tasks.base import TaskBase, TaskRenderContext, render_fitted_text
 from game.tasks.input_utils import read_left_right_key
 
 
+_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+_ALPHABET_BYTES = _ALPHABET.encode("ascii")
+
+
 class SequenceMemoryTask(TaskBase):
     task_id = "sequence_memory"
 
     def __init__(self, spec: TaskSpec, rng: random.Random) -> None:
         super().__init__(spec)
-        alphabet = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
-        self.sequence: List[str] = [rng.choice(alphabet) for _ in range(spec.difficulty["seq_len"])]
-        self.query_symbol = rng.choice(alphabet)
-        self.answer_is_yes = self.query_symbol in self.sequence
+        # Последовательность храним компактно в bytes: проверка вхождения идет через memchr.
+        self.sequence_bytes = bytes(rng.choices(_ALPHABET_BYTES, k=spec.difficulty["seq_len"]))
+        self.sequence = self.sequence_bytes.decode("ascii")
+        self.query_symbol = rng.choice(_ALPHABET)
+        self.answer_is_yes = ord(self.query_symbol) in self.sequence_bytes
+        self._seq_str = " ".join(self.sequence)
+        self._question_text = f"Был ли '{self.query_symbol}'?"
         max_show = int(spec.difficulty["time_limit_ms"] * 0.8)
         base_show = 900 + 200 * len(self.sequence)
         self.show_until_ms = self.created_ms + min(base_show, max_show)
@@ -43,9 +49,8 @@ class SequenceMemoryTask(TaskBase):
         max_text_width = ctx.rect.width - 32
         now_ms = pygame.time.get_ticks()
         if now_ms < self.show_until_ms:
-            seq = " ".join(self.sequence)
             surf = render_fitted_text(
-                seq,
+                self._seq_str,
                 ctx.color_main,
                 [ctx.font_big, ctx.font_mid, ctx.font_small],
                 max_text_width,
@@ -61,9 +66,8 @@ class SequenceMemoryTask(TaskBase):
         if now_ms < self.query_ready_ms:
             return
 
-        question = f"Был ли '{self.query_symbol}'?"
         surf = render_fitted_text(
-            question,
+            self._question_text,
             ctx.color_main,
             [ctx.font_mid, ctx.font_small],
             max_text_width,
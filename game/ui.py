@@ -1,6 +1,7 @@
+from collections import OrderedDict
 from dataclasses import dataclass
-import math
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 import pygame
 
@@ -15,6 +16,78 @@ class UiTheme:
     alert: Tuple[int, int, int] = (240, 120, 40)
 
 
+@dataclass(frozen=True, slots=True)
+class _Layout:
+    # Итоговые целые координаты текста панелей: в кадре читаются как обычные атрибуты, без Rect.
+    focus_x: int
+    focus_y: int
+    stats_x: int
+    stats_y: int
+    help_x: int
+    help_y: int
+    mission_text_x: int
+    mission_header_y: int
+    mission_track_x: int
+    mission_track_top: int
+    mission_track_bottom: int
+    mission_progress_y: int
+    mission_planets_y: int
+
+
+@lru_cache(maxsize=8)
+def _gen_stars(w: int, h: int, count: int) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    # Детерминированный LCG от размера окна; GameUI пересоздается при ресайзе, результат переиспользуется.
+    # Координаты и радиусы хранятся отдельными колонками (x, y, r).
+    rng = (w * 73856093) ^ (h * 19349663)
+    xs, ys, rs = [], [], []
+    x = rng & 0xFFFF
+    y = (rng >> 4) & 0xFFFF
+    for _ in range(count):
+        x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        y = (y * 1103515245 + 54321) & 0x7FFFFFFF
+        xs.append(x % w)
+        ys.append(y % h)
+        rs.append((x % 2) + 1)
+    return tuple(xs), tuple(ys), tuple(rs)
+
+
+def _snap_color(color) -> Tuple[int, ...]:
+    # Интерполированные (float) цвета и pygame.Color приводятся к целому кортежу,
+    # чтобы анимация цвета не плодила промахи в кэше текста.
+    return tuple(map(round, color))
+
+
+_TEXT_CACHE_SIZE = 256
+_HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+_FRAME_COLORKEY = (255, 0, 255)
+_STAR_COLOR = (20, 30, 55)
+_TITLE_SHADOW = (12, 20, 40)
+_GLOW_BUCKETS = 11
+
+# Путь к шрифту ищется один раз на процесс; шрифты одного размера переиспользуются между GameUI.
+_FONT_CANDIDATES = (
+    "sfprotext",
+    "sfprodisplay",
+    "helveticaneue",
+    "avenirnext",
+    "avenir",
+    "segoeui",
+    "arial",
+)
+_font_cache: Dict[Tuple[Optional[str], int, bool], pygame.font.Font] = {}
+
+
+@lru_cache(maxsize=1)
+def _find_font_path() -> Optional[str]:
+    # match_font опрашивает системный список шрифтов; кэшируется и отрицательный результат,
+    # иначе без подходящего шрифта каждый _make_font повторял бы все попытки.
+    for name in _FONT_CANDIDATES:
+        path = pygame.font.match_font(name)
+        if path:
+            return path
+    return None
+
+
 class GameUI:
     def __init__(self, screen: pygame.Surface) -> None:
         self.screen = screen
@@ -27,7 +100,28 @@ class GameUI:
         self.font_mid = self._make_font(max(22, int(28 * self.ui_scale)))
         self.font_small = self._make_font(max(16, int(21 * self.ui_scale)))
         self.font_tiny = self._make_font(max(14, int(17 * self.ui_scale)))
-        self.stars = self._build_stars(80)
+        self._star_xs, self._star_ys, self._star_rs = self._build_stars(80)
+        self._static = self._build_static_text()
+        self._text_cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        # Цвета темы в ключе кэша заменяются маленькими int — ключ короче, хеш дешевле.
+        theme_colors = (
+            self.theme.text,
+            self.theme.accent,
+            self.theme.alert,
+            self.theme.border,
+            self.theme.panel,
+            self.theme.bg,
+            _TITLE_SHADOW,
+        )
+        self._color_ids: Dict[Tuple[int, int, int], int] = {}
+        for color in theme_colors:
+            self._color_ids.setdefault(color, len(self._color_ids))
+        # Для покадровых draw-вызовов цвет заранее собран в pygame.Color; ключи кэшей остаются кортежами.
+        self._track_color = pygame.Color(self.theme.border)
+        self._panel_cache: Dict[str, Tuple[tuple, pygame.Surface, Tuple[int, int]]] = {}
+        self._title_cache: Dict[str, Tuple[pygame.Surface, pygame.Rect]] = {}
+        self._chrome_cache: Dict[tuple, pygame.Surface] = {}
+        self._fit_cache: Dict[tuple, pygame.Surface] = {}
 
         margin = max(8, min(20, self.w // 70))
         top = max(60, min(84, self.h // 12))
@@ -78,6 +172,22 @@ class GameUI:
             self.left_panel.width,
             help_h,
         )
+        # Разметка панелей не меняется до пересоздания GameUI — считаем ее один раз.
+        self._layout = _Layout(
+            focus_x=self.left_focus_panel.x + 16,
+            focus_y=self.left_focus_panel.y + 12,
+            stats_x=self.left_stats_panel.x + 16,
+            stats_y=self.left_stats_panel.y + 14,
+            help_x=self.left_help_panel.x + 16,
+            help_y=self.left_help_panel.y + 12,
+            mission_text_x=self.center_panel.x + 16,
+            mission_header_y=self.center_panel.y + 12,
+            mission_track_x=self.center_panel.x + self.center_panel.width // 2,
+            mission_track_top=self.center_panel.y + 84,
+            mission_track_bottom=self.center_panel.bottom - 42,
+            mission_progress_y=self.center_panel.bottom - 28,
+            mission_planets_y=self.center_panel.bottom - 54,
+        )
 
         panel_pad = 8 if self.compact else 10
         task_gap = 8 if self.compact else 10
@@ -91,13 +201,38 @@ class GameUI:
             )
             for i in range(3)
         ]
-
-    def clear(self) -> None:
-        self.screen.fill(self.theme.bg)
-        for (x, y, r) in self.stars:
-            pygame.draw.circle(self.screen, (20, 30, 55), (x, y), r)
-
-    def draw_frame(self) -> None:
+        self._bg_surface = self._build_background()
+        self._frame_bg = self._build_frame_layer()
+        self._rocket_sprite = self._build_rocket_sprite()
+        self._glow_cache = self._build_glow_cache()
+
+    def _build_background(self) -> pygame.Surface:
+        # Фон и звезды статичны: clear() сводится к одному blit.
+        # Формат пикселей совпадает с экраном, поэтому blit в clear() идет без конвертации.
+        background = pygame.Surface((self.w, self.h)).convert(self.screen)
+        background.fill(self.theme.bg)
+        # Звезды бывают только радиуса 1 и 2: рисуем по спрайту на радиус и кладем их одной пачкой.
+        sprites = {r: self._build_star_sprite(r) for r in set(self._star_rs)}
+        pairs = [
+            (sprites[r], (x - r, y - r)) for x, y, r in zip(self._star_xs, self._star_ys, self._star_rs)
+        ]
+        if _HAS_FBLITS:
+            background.fblits(pairs)
+        else:
+            background.blits(pairs, doreturn=False)
+        return background
+
+    @staticmethod
+    def _build_star_sprite(radius: int) -> pygame.Surface:
+        sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, _STAR_COLOR, (radius, radius), radius)
+        return sprite
+
+    def _build_frame_layer(self) -> pygame.Surface:
+        # Рамки панелей не двигаются: рисуем их один раз на слой с прозрачным colorkey.
+        layer = pygame.Surface((self.w, self.h)).convert(self.screen)
+        layer.fill(_FRAME_COLORKEY)
+        layer.set_colorkey(_FRAME_COLORKEY, pygame.RLEACCEL)
         for rect in [
             self.left_panel,
             self.center_panel,
@@ -106,15 +241,131 @@ class GameUI:
             self.left_stats_panel,
             self.left_help_panel,
         ]:
-            pygame.draw.rect(self.screen, self.theme.panel, rect, border_radius=10)
-            pygame.draw.rect(self.screen, self.theme.border, rect, width=2, border_radius=10)
+            pygame.draw.rect(layer, self.theme.panel, rect, border_radius=10)
+            pygame.draw.rect(layer, self.theme.border, rect, width=2, border_radius=10)
+        return layer
+
+    def _chrome(self, size: Tuple[int, int], fill: Tuple[int, int, int], border: Tuple[int, int, int]) -> pygame.Surface:
+        # Подложка карточки/кнопки: заливка и рамка рисуются один раз на размер и пару цветов.
+        key = (size, fill, border)
+        layer = self._chrome_cache.get(key)
+        if layer is None:
+            layer = pygame.Surface(size).convert(self.screen)
+            layer.fill(_FRAME_COLORKEY)
+            layer.set_colorkey(_FRAME_COLORKEY, pygame.RLEACCEL)
+            local = pygame.Rect((0, 0), size)
+            pygame.draw.rect(layer, fill, local, border_radius=10)
+            pygame.draw.rect(layer, border, local, width=2, border_radius=10)
+            self._chrome_cache[key] = layer
+        return layer
+
+    def _build_rocket_sprite(self) -> pygame.Surface:
+        # Ракета: треугольник 25x35 и пламя 10x10 под ним; в кадре меняется только позиция.
+        sprite = pygame.Surface((25, 44), pygame.SRCALPHA)
+        pygame.draw.polygon(sprite, self.theme.accent, [(12, 0), (0, 34), (24, 34)])
+        pygame.draw.rect(sprite, (220, 90, 40), (7, 34, 10, 10))
+        return sprite.convert_alpha(self.screen)
+
+    def _build_glow_cache(self) -> list:
+        # Радиус ореола 22 + int(10 * q) дает 11 значений: по одному кольцу на шаг качества 0.1.
+        cache = []
+        for bucket in range(_GLOW_BUCKETS):
+            q = bucket / (_GLOW_BUCKETS - 1)
+            radius = 22 + int(10 * q)
+            color = (int(80 + 120 * q), int(110 + 100 * q), int(120 + 90 * q))
+            ring = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
+            pygame.draw.circle(ring, color, (radius + 2, radius + 2), radius, width=2)
+            cache.append((ring.convert_alpha(self.screen), radius))
+        return cache
+
+    def _build_static_text(self) -> Dict[str, pygame.Surface]:
+        # Неизменяемые подписи растеризуются один раз, в кадре остается только blit.
+        theme = self.theme
+        return {
+            "stats_header": self._rasterize(self.font_mid, "Статистика", theme.accent),
+            "focus_header": self._rasterize(self.font_mid, "Текущая задача", theme.accent),
+            "focus_late": self._rasterize(self.font_mid, "Слишком поздно", theme.alert),
+            "focus_unit": self._rasterize(self.font_small, "сек до конца", theme.text),
+            "help_header": self._rasterize(self.font_mid, "Шпаргалка", theme.accent),
+            "help_action": self._rasterize(self.font_small, "F/J действие", theme.text),
+            "help_exit": self._rasterize(self.font_small, "esc выход", theme.text),
+            "mission_header": self._rasterize(self.font_mid, "Маршрут миссии", theme.accent),
+            "mission_sub": self._rasterize(self.font_tiny, "Удерживай точность и темп, чтобы долететь", theme.text),
+            "mission_goal": self._rasterize(self.font_tiny, "ЦЕЛЬ", theme.text),
+        }
+
+    def _rasterize(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        # Кэшируемые поверхности сразу приводятся к формату экрана: blit идет без конвертации пикселей.
+        return font.render(text, True, color).convert_alpha(self.screen)
+
+    def _render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        # LRU-кэш растеризованных строк: проценты, секунды и счетчики меняются редко.
+        cid = self._color_ids.get(color) if type(color) is tuple else None
+        if cid is None:
+            color = _snap_color(color)
+            cid = color
+        key = (id(font), text, cid)
+        surf = self._text_cache.get(key)
+        if surf is not None:
+            self._text_cache.move_to_end(key)
+            return surf
+        surf = self._rasterize(font, text, color)
+        self._text_cache[key] = surf
+        if len(self._text_cache) > _TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return surf
+
+    def _blit_many(self, pairs: list) -> None:
+        # Один вызов в C на пачку поверхностей; fblits есть только в pygame-ce.
+        if _HAS_FBLITS:
+            self.screen.fblits(pairs)
+        else:
+            self.screen.blits(pairs, doreturn=False)
+
+    def _blit_cached_panel(self, name: str, key: tuple) -> bool:
+        # Если входные данные панели не менялись с прошлого кадра, хватает одного blit готового слоя.
+        cached = self._panel_cache.get(name)
+        if cached is None or cached[0] != key:
+            return False
+        self.screen.blit(cached[1], cached[2])
+        return True
+
+    def _cache_panel(self, name: str, key: tuple, pairs: list) -> None:
+        bounds = pygame.Rect(pairs[0][1], pairs[0][0].get_size())
+        bounds.unionall_ip([pygame.Rect(pos, surf.get_size()) for surf, pos in pairs[1:]])
+        layer = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        blit = layer.blit
+        ox, oy = bounds.topleft
+        for surf, (px, py) in pairs:
+            # MAX по каналам копирует сглаженный текст на прозрачный слой без темной каймы.
+            blit(surf, (px - ox, py - oy), special_flags=pygame.BLEND_RGBA_MAX)
+        layer = layer.convert_alpha(self.screen)
+        self._panel_cache[name] = (key, layer, bounds.topleft)
+        self.screen.blit(layer, bounds.topleft)
+
+    def clear(self) -> None:
+        self.screen.blit(self._bg_surface, (0, 0))
+
+    def draw_frame(self) -> None:
+        self.screen.blit(self._frame_bg, (0, 0))
 
     def draw_title(self, text: str) -> None:
-        shadow = self.font_big.render(text, True, (12, 20, 40))
+        entry = self._title_cache.get(text)
+        if entry is None:
+            entry = self._build_title(text)
+            self._title_cache[text] = entry
+        self.screen.blit(*entry)
+
+    def _build_title(self, text: str) -> Tuple[pygame.Surface, pygame.Rect]:
+        # Тень и основной текст склеиваются в один слой: вместо двух render + двух blit за кадр один blit.
+        shadow = self.font_big.render(text, True, _TITLE_SHADOW)
         main = self.font_big.render(text, True, self.theme.accent)
+        w, h = main.get_size()
+        composed = pygame.Surface((w + 2, h + 2), pygame.SRCALPHA)
+        composed.blit(shadow, (2, 2))
+        composed.blit(main, (0, 0))
         rect = main.get_rect(center=(self.w // 2, 48))
-        self.screen.blit(shadow, (rect.x + 2, rect.y + 2))
-        self.screen.blit(main, rect)
+        return composed.convert_alpha(self.screen), pygame.Rect(rect.x, rect.y, w + 2, h + 2)
 
     def draw_status(
         self,
@@ -124,61 +375,63 @@ class GameUI:
         level: int,
         planets_visited: int,
     ) -> None:
-        x = self.left_stats_panel.x + 16
-        y = self.left_stats_panel.y + 14
-        header = self.font_mid.render("Статистика", True, self.theme.accent)
-        self.screen.blit(header, (x, y))
+        stability_pct = int(stability * 100)
+        key = (planets_visited, level, stability_pct, tasks_done, total_tasks)
+        if self._blit_cached_panel("status", key):
+            return
+        x = self._layout.stats_x
+        y = self._layout.stats_y
         lines = [
             f"Планет: {planets_visited}",
             f"Уровень: {level}",
-            f"Стабильность: {int(stability * 100)}%",
+            f"Стабильность: {stability_pct}%",
             f"Задачи: {tasks_done}/{total_tasks}",
         ]
+        render = self._render
+        font = self.font_small
+        color = self.theme.text
+        pairs = [(self._static["stats_header"], (x, y))]
         yy = y + 38
         for line in lines:
-            surf = self.font_small.render(line, True, self.theme.text)
-            self.screen.blit(surf, (x, yy))
+            pairs.append((render(font, line, color), (x, yy)))
             yy += 28
+        self._cache_panel("status", key, pairs)
 
     def draw_focus_panel(
         self, task_name: Optional[str], time_left_ms: Optional[int], show_timeout_alert: bool
     ) -> None:
-        x = self.left_focus_panel.x + 16
-        y = self.left_focus_panel.y + 12
-        header = self.font_mid.render("Текущая задача", True, self.theme.accent)
-        self.screen.blit(header, (x, y))
-
         if show_timeout_alert:
-            late = self.font_mid.render("Слишком поздно", True, self.theme.alert)
-            self.screen.blit(late, (x, y + 98))
-            return
-
-        if task_name is None or time_left_ms is None:
+            key: tuple = ("late",)
+        elif task_name is None or time_left_ms is None:
+            key = ("idle",)
+        else:
+            # Целочисленный ceil: секунда в ключе меняется раз в 1000 мс, остальные кадры — попадание в кэш.
+            key = (task_name, 0 if time_left_ms <= 0 else (time_left_ms + 999) // 1000)
+        if self._blit_cached_panel("focus", key):
             return
 
-        task = self.font_small.render(task_name, True, self.theme.text)
-        self.screen.blit(task, (x, y + 40))
-
-        seconds_left = max(0, math.ceil(time_left_ms / 1000.0))
-        sec_text = self.font_huge.render(str(seconds_left), True, self.theme.accent)
-        self.screen.blit(sec_text, (x, y + 64))
-        unit_text = self.font_small.render("сек до конца", True, self.theme.text)
-        self.screen.blit(unit_text, (x, y + 136))
+        x = self._layout.focus_x
+        y = self._layout.focus_y
+        pairs = [(self._static["focus_header"], (x, y))]
+        if key == ("late",):
+            pairs.append((self._static["focus_late"], (x, y + 98)))
+        elif key != ("idle",):
+            pairs.append((self._render(self.font_small, task_name, self.theme.text), (x, y + 40)))
+            pairs.append((self._render(self.font_huge, str(key[1]), self.theme.accent), (x, y + 64)))
+            pairs.append((self._static["focus_unit"], (x, y + 136)))
+        self._cache_panel("focus", key, pairs)
 
     def draw_help_panel(self) -> None:
-        x = self.left_help_panel.x + 16
-        y = self.left_help_panel.y + 12
-        header = self.font_mid.render("Шпаргалка", True, self.theme.accent)
-        self.screen.blit(header, (x, y))
-        lines = [
-            "F/J действие",
-            "esc выход",
+        if self._blit_cached_panel("help", ()):
+            return
+        x = self._layout.help_x
+        y = self._layout.help_y
+        pairs = [
+            (self._static["help_header"], (x, y)),
+            (self._static["help_action"], (x, y + 38)),
+            (self._static["help_exit"], (x, y + 66)),
         ]
-        yy = y + 38
-        for line in lines:
-            surf = self.font_small.render(line, True, self.theme.text)
-            self.screen.blit(surf, (x, yy))
-            yy += 28
+        self._cache_panel("help", (), pairs)
 
     def draw_mission_panel(
         self,
@@ -188,57 +441,38 @@ class GameUI:
         total_tasks: int,
         planets_visited: int,
     ) -> None:
-        rect = self.center_panel
-        x = rect.x + 16
-        y = rect.y + 12
-        header = self.font_mid.render("Маршрут миссии", True, self.theme.accent)
-        self.screen.blit(header, (x, y))
-
-        sub = self.font_tiny.render("Удерживай точность и темп, чтобы долететь", True, self.theme.text)
-        self.screen.blit(sub, (x, y + 30))
-
-        track_top = y + 72
-        track_bottom = rect.bottom - 42
-        track_x = rect.x + rect.width // 2
-        pygame.draw.line(self.screen, self.theme.border, (track_x, track_top), (track_x, track_bottom), 4)
-
-        quality_color = (
-            int(80 + 120 * zone_quality),
-            int(110 + 100 * zone_quality),
-            int(120 + 90 * zone_quality),
-        )
-        glow_radius = 22 + int(10 * zone_quality)
-        pygame.draw.circle(self.screen, quality_color, (track_x, track_top), glow_radius, width=2)
+        layout = self._layout
+        x = layout.mission_text_x
+        y = layout.mission_header_y
+        self._blit_many([(self._static["mission_header"], (x, y)), (self._static["mission_sub"], (x, y + 30))])
 
-        progress = max(0.0, min(1.0, flight_progress))
-        rocket_y = int(track_bottom - (track_bottom - track_top) * progress)
-        rocket = [
-            (track_x, rocket_y - 20),
-            (track_x - 12, rocket_y + 14),
-            (track_x + 12, rocket_y + 14),
-        ]
-        pygame.draw.polygon(self.screen, self.theme.accent, rocket)
-        pygame.draw.rect(self.screen, (220, 90, 40), (track_x - 5, rocket_y + 14, 10, 10))
+        track_top = layout.mission_track_top
+        track_bottom = layout.mission_track_bottom
+        track_x = layout.mission_track_x
+        pygame.draw.line(self.screen, self._track_color, (track_x, track_top), (track_x, track_bottom), 4)
 
-        goal_label = self.font_tiny.render("ЦЕЛЬ", True, self.theme.text)
-        self.screen.blit(goal_label, (track_x + 24, track_top - 10))
+        # Корзина — ровно int(10 * q) прежней формулы радиуса: квантуется только цвет кольца.
+        bucket = int(max(0.0, min(1.0, zone_quality)) * (_GLOW_BUCKETS - 1))
+        glow, glow_radius = self._glow_cache[bucket]
+        self.screen.blit(glow, (track_x - glow_radius - 2, track_top - glow_radius - 2))
 
-        progress_line = self.font_small.render(
-            f"Прогресс: {tasks_done}/{total_tasks}",
-            True,
-            self.theme.text,
-        )
-        self.screen.blit(progress_line, (x, rect.bottom - 28))
-        planets_line = self.font_small.render(
-            f"Посещено планет: {planets_visited}",
-            True,
-            self.theme.text,
+        progress = max(0.0, min(1.0, flight_progress))
+        # Все координаты blit целые: дробная позиция ракеты отсекается до пикселя.
+        rocket_y = int(track_bottom - (track_bottom - track_top) * progress)
+        self.screen.blit(self._rocket_sprite, (track_x - 12, rocket_y - 20))
+
+        progress_line = self._render(self.font_small, f"Прогресс: {tasks_done}/{total_tasks}", self.theme.text)
+        planets_line = self._render(self.font_small, f"Посещено планет: {planets_visited}", self.theme.text)
+        self._blit_many(
+            [
+                (self._static["mission_goal"], (track_x + 24, track_top - 10)),
+                (progress_line, (x, layout.mission_progress_y)),
+                (planets_line, (x, layout.mission_planets_y)),
+            ]
         )
-        self.screen.blit(planets_line, (x, rect.bottom - 54))
 
     def draw_task_panel(self, rect: pygame.Rect, title: str, active: bool) -> None:
-        pygame.draw.rect(self.screen, self.theme.panel, rect, border_radius=10)
-        pygame.draw.rect(self.screen, self.theme.border, rect, width=2, border_radius=10)
+        self.screen.blit(self._chrome(rect.size, self.theme.panel, self.theme.border), rect.topleft)
         color = self.theme.accent if active else self.theme.text
         self._draw_fitted_text(
             text=title,
@@ -250,8 +484,7 @@ class GameUI:
     def draw_button(self, rect: pygame.Rect, label: str, active: bool = False) -> None:
         fill = (26, 34, 52) if not active else (22, 52, 66)
         border = self.theme.accent if active else self.theme.border
-        pygame.draw.rect(self.screen, fill, rect, border_radius=10)
-        pygame.draw.rect(self.screen, border, rect, width=2, border_radius=10)
+        self.screen.blit(self._chrome(rect.size, fill, border), rect.topleft)
         self._draw_fitted_text(text=label, rect=rect, color=self.theme.text, align="center")
 
     def _draw_fitted_text(
@@ -261,51 +494,45 @@ class GameUI:
         color: Tuple[int, int, int],
         align: str = "center",
     ) -> None:
-        fonts = [self.font_small, self.font_tiny]
-        surf = None
-        for font in fonts:
-            if font.size(text)[0] <= rect.width - 12:
-                surf = font.render(text, True, color)
-                break
+        # Подбор шрифта и обрезка по ширине выполняются один раз на (текст, ширина, цвет).
+        key = (text, rect.width, color)
+        surf = self._fit_cache.get(key)
         if surf is None:
-            fallback_size = max(12, int(self.font_tiny.get_height() * 0.85))
-            fallback = self._make_font(fallback_size)
-            clipped = text
-            while len(clipped) > 3 and fallback.size(clipped + "...")[0] > rect.width - 12:
-                clipped = clipped[:-1]
-            surf = fallback.render((clipped + "...") if clipped != text else text, True, color)
+            surf = self._fit_text(text, rect.width, color)
+            if len(self._fit_cache) >= _TEXT_CACHE_SIZE:
+                self._fit_cache.pop(next(iter(self._fit_cache)))
+            self._fit_cache[key] = surf
         if align == "left":
             text_rect = surf.get_rect(midleft=(rect.x + 6, rect.centery))
         else:
             text_rect = surf.get_rect(center=rect.center)
         self.screen.blit(surf, text_rect)
 
+    def _fit_text(self, text: str, width: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        for font in (self.font_small, self.font_tiny):
+            if font.size(text)[0] <= width - 12:
+                return self._render(font, text, color)
+        fallback_size = max(12, int(self.font_tiny.get_height() * 0.85))
+        fallback = self._make_font(fallback_size)
+        clipped = text
+        while len(clipped) > 3 and fallback.size(clipped + "...")[0] > width - 12:
+            clipped = clipped[:-1]
+        return self._render(fallback, (clipped + "...") if clipped != text else text, color)
+
     def _make_font(self, size: int, bold: bool = False) -> pygame.font.Font:
-        candidates = [
-            "sfprotext",
-            "sfprodisplay",
-            "helveticaneue",
-            "avenirnext",
-            "avenir",
-            "segoeui",
-            "arial",
-        ]
-        for name in candidates:
-            path = pygame.font.match_font(name)
-            if path:
-                font = pygame.font.Font(path, size)
-                if bold:
-                    font.set_bold(True)
-                return font
-        return pygame.font.SysFont(None, size, bold=bold)
-
-    def _build_stars(self, count: int):
-        rng = (self.w * 73856093) ^ (self.h * 19349663)
-        stars = []
-        x = rng & 0xFFFF
-        y = (rng >> 4) & 0xFFFF
-        for _ in range(count):
-            x = (x * 1103515245 + 12345) & 0x7FFFFFFF
-            y = (y * 1103515245 + 54321) & 0x7FFFFFFF
-            stars.append((x % self.w, y % self.h, (x % 2) + 1))
-        return stars
+        font_path = _find_font_path()
+        key = (font_path, size, bold)
+        font = _font_cache.get(key)
+        if font is not None:
+            return font
+        if font_path:
+            font = pygame.font.Font(font_path, size)
+            if bold:
+                font.set_bold(True)
+        else:
+            font = pygame.font.SysFont(None, size, bold=bold)
+        _font_cache[key] = font
+        return font
+
+    def _build_stars(self, count: int) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+        return _gen_stars(self.w, self.h, count)
@@ -9,12 +9,27 @@ import os
 from pathlib import Path
 
 
-def run(cmd: list[str], cwd: Path) -> None:
+def run(cmd: list[str], cwd: Path, quiet: bool = False) -> None:
     print(">", " ".join(cmd))
-    subprocess.run(cmd, cwd=str(cwd), check=True)
+    if not quiet:
+        subprocess.run(cmd, cwd=str(cwd), check=True)
+        return
+    # PyInstaller пишет лог в stderr: держим его в памяти и показываем только при ошибке.
+    result = subprocess.run(cmd, cwd=str(cwd), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
 
 
-def zip_output(dist_dir: Path, archive_name: str) -> Path:
+# Уже сжатые файлы (PYZ и base_library.zip от PyInstaller, картинки) повторно не жмем — только тратим CPU.
+_STORED_SUFFIXES = {".pyz", ".zip", ".gz", ".bz2", ".xz", ".png", ".jpg", ".jpeg", ".whl"}
+
+
+def _compress_type(path: Path) -> int:
+    return zipfile.ZIP_STORED if path.suffix.lower() in _STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def zip_output(dist_dir: Path, archive_name: str, compresslevel: int = 6) -> Path:
     candidates = [dist_dir / "NeuroGame.app", dist_dir / "NeuroGame", dist_dir / "NeuroGame.exe"]
     target = next((p for p in candidates if p.exists()), None)
     if target is None:
@@ -23,13 +38,15 @@ def zip_output(dist_dir: Path, archive_name: str) -> Path:
     archive_path = dist_dir / archive_name
     if archive_path.exists():
         archive_path.unlink()
-    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(
+        archive_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+    ) as zf:
         if target.is_dir():
             for p in sorted(target.rglob("*")):
                 if p.is_file():
-                    zf.write(p, arcname=str(p.relative_to(target.parent)))
+                    zf.write(p, arcname=str(p.relative_to(target.parent)), compress_type=_compress_type(p))
         else:
-            zf.write(target, arcname=target.name)
+            zf.write(target, arcname=target.name, compress_type=_compress_type(target))
     return archive_path
 
 
@@ -40,6 +57,19 @@ def main() -> None:
         action="store_true",
         help="Install/upgrade PyInstaller before build",
     )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Hide pip/PyInstaller output unless the command fails",
+    )
+    parser.add_argument(
+        "--zip-level",
+        type=int,
+        choices=range(0, 10),
+        default=6,
+        metavar="0-9",
+        help="Deflate level for the release archive (lower is faster, default 6)",
+    )
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parents[1]
@@ -69,7 +99,7 @@ def main() -> None:
         for attempt in range(1, 4):
             try:
                 print(f"Installing PyInstaller (attempt {attempt}/3)...")
-                run(install_cmd, cwd=root)
+                run(install_cmd, cwd=root, quiet=args.quiet)
                 last_err = None
                 break
             except subprocess.CalledProcessError as exc:
@@ -124,11 +154,11 @@ def main() -> None:
         print("Using PyInstaller onedir mode from NEUROGAME_PYINSTALLER_MODE=onedir")
     else:
         build_cmd.insert(5, "--onefile")
-    run(build_cmd, cwd=root)
+    run(build_cmd, cwd=root, quiet=args.quiet)
 
     print("[3/4] Preparing release archive...")
     platform_tag = f"{platform.system().lower()}-{platform.machine().lower()}"
-    archive = zip_output(dist, f"neurogame-{platform_tag}.zip")
+    archive = zip_output(dist, f"neurogame-{platform_tag}.zip", compresslevel=args.zip_level)
 
     print("[4/4] Done.")
     print(f"Primary output dir: {dist}")
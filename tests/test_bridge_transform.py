@@ -0,0 +1,33 @@
+import json
+import math
+
+from training.bridge_transform import _as_dict, transform_raw_events
+
+
+def test_string_payload_with_nan_is_parsed():
+    payload = json.dumps({"reward": float("nan"), "step": 1})
+    parsed = _as_dict(payload)
+    assert parsed["step"] == 1
+    assert math.isnan(parsed["reward"])
+
+
+def test_string_payload_keeps_wide_integers_exact():
+    big = 2**70 + 1
+    assert _as_dict(json.dumps({"event_seq": big}))["event_seq"] == big
+
+
+def test_nan_payload_reaches_adaptation_record():
+    row = {
+        "event_id": "e1",
+        "event_type": "adaptation_step",
+        "event_ts": "2026-01-01T00:00:00Z",
+        "user_id": "u1",
+        "session_id": "s1",
+        "model_version": "baseline_v1",
+        "payload": json.dumps({"step": 3, "reward": float("nan"), "state": [0.5], "action_id": 2}),
+    }
+    _, adaptations, _ = transform_raw_events([row])
+    assert adaptations[0]["step"] == 3
+    assert adaptations[0]["action_id"] == 2
+    assert adaptations[0]["state"] == [0.5]
+    assert math.isnan(adaptations[0]["reward"])
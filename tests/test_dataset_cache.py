@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from training.dataset import build_transitions, load_adaptations, load_transition_batch
+
+
+def _write_adaptations(path):
+    records = []
+    for step in range(6):
+        records.append(
+            {
+                "session_id": "s1" if step < 3 else "s2",
+                "step": step,
+                "mode": "baseline" if step % 2 else "ppo",
+                "state": [float(step), 1.0, 2.0],
+                "action_id": step % 3,
+                "action_space": "tempo3",
+                "reward": 0.1 * step,
+            }
+        )
+    path.write_text("".join(json.dumps(rec) + "\n" for rec in records), encoding="utf-8")
+
+
+def _assert_same_batch(actual, expected):
+    assert actual.session_ids == expected.session_ids
+    for name in ("states", "actions", "task_actions", "rewards", "next_states", "dones"):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+
+
+@pytest.mark.parametrize("damage", ["truncated", "empty"])
+def test_damaged_cache_is_rebuilt(tmp_path, damage):
+    data = tmp_path / "adaptations.jsonl"
+    _write_adaptations(data)
+    expected = build_transitions(load_adaptations(str(data)))
+
+    load_transition_batch(str(data))
+    cache = tmp_path / "adaptations.jsonl.all.cache.npz"
+    raw = cache.read_bytes()
+    cache.write_bytes(raw[: len(raw) // 2] if damage == "truncated" else b"")
+
+    _assert_same_batch(load_transition_batch(str(data)), expected)
+    # Поврежденный файл перезаписан целым кэшем.
+    _assert_same_batch(load_transition_batch(str(data)), expected)
+    assert cache.stat().st_size == len(raw)
+
+
+def test_modes_use_separate_cache_files(tmp_path):
+    data = tmp_path / "adaptations.jsonl"
+    _write_adaptations(data)
+
+    baseline = load_transition_batch(str(data), modes={"baseline"})
+    ppo = load_transition_batch(str(data), modes={"ppo"})
+
+    assert (tmp_path / "adaptations.jsonl.baseline.cache.npz").exists()
+    assert (tmp_path / "adaptations.jsonl.ppo.cache.npz").exists()
+    records = load_adaptations(str(data))
+    _assert_same_batch(load_transition_batch(str(data), modes={"baseline"}), baseline)
+    _assert_same_batch(baseline, build_transitions(records, modes={"baseline"}))
+    _assert_same_batch(ppo, build_transitions(records, modes={"ppo"}))
@@ -1,10 +1,35 @@
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+try:
+    from ciso8601 import parse_datetime as _fast_parse_datetime  # type: ignore
+except ImportError:
+    _fast_parse_datetime = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# Длинные числа: orjson молча превращает целые шире 64 бит во float, такие строки разбирает stdlib.
+_LONG_NUMBER = re.compile(r"\d{19,}")
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is None or _LONG_NUMBER.search(text):
+        return json.loads(text)
+    try:
+        return orjson.loads(text)
+    except ValueError:
+        # orjson строже stdlib: NaN/Infinity, которые пишет json.dumps на backend, разбираем как раньше.
+        return json.loads(text)
 
 
 def parse_ts_seconds(value: Any) -> int:
@@ -13,6 +38,16 @@ def parse_ts_seconds(value: Any) -> int:
     if not isinstance(value, str) or not value.strip():
         return int(datetime.now(tz=timezone.utc).timestamp())
     text = value.strip()
+    if _fast_parse_datetime is not None:
+        # Быстрый C-парсер ISO 8601, если установлен; на нестандартных строках — обычный путь ниже.
+        try:
+            dt = _fast_parse_datetime(text)
+        except ValueError:
+            pass
+        else:
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return int(dt.timestamp())
     if text.endswith("Z"):
         text = text[:-1] + "+00:00"
     try:
@@ -24,11 +59,18 @@ def parse_ts_seconds(value: Any) -> int:
     return int(dt.timestamp())
 
 
-def to_jsonl(path: Path, records: list[dict[str, Any]]) -> None:
+def _jsonl_line(rec: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        # orjson сразу отдает UTF-8 байты без промежуточной str; NaN/Infinity пишутся как null.
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def to_jsonl(path: Path, records: Iterable[dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for rec in records:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    # Записи идут через буфер файла по мере поступления: список строк целиком не собирается.
+    with path.open("wb") as f:
+        f.writelines(_jsonl_line(rec) for rec in records)
 
 
 def _as_dict(value: Any) -> dict[str, Any]:
@@ -36,8 +78,8 @@ def _as_dict(value: Any) -> dict[str, Any]:
         return value
     if isinstance(value, str):
         try:
-            parsed = json.loads(value)
-        except json.JSONDecodeError:
+            parsed = _json_loads(value)
+        except ValueError:
             return {}
         if isinstance(parsed, dict):
             return parsed
@@ -56,11 +98,18 @@ def _normalize_task_offsets(value: Any) -> dict[str, int]:
     return out
 
 
+@lru_cache(maxsize=64)
+def _mode_from_version(model_version: str) -> str:
+    # Версий моделей в выгрузке единицы, а строк — десятки тысяч: lower() считается один раз на версию.
+    return "ppo" if "ppo" in model_version.lower() else "baseline"
+
+
 def _infer_mode(model_version: Any, payload: dict[str, Any]) -> str:
-    if isinstance(payload.get("mode"), str):
-        return payload["mode"]
-    if isinstance(model_version, str) and "ppo" in model_version.lower():
-        return "ppo"
+    mode = payload.get("mode")
+    if isinstance(mode, str):
+        return mode
+    if isinstance(model_version, str):
+        return _mode_from_version(model_version)
     return "baseline"
 
 
@@ -118,12 +167,9 @@ class InferredSessionAgg:
         }
 
 
-def transform_raw_events(
-    rows: list[dict[str, Any]],
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
-    event_records: list[dict[str, Any]] = []
-    adaptation_records: list[dict[str, Any]] = []
-    session_records: list[dict[str, Any]] = []
+def iter_transformed_events(rows: Iterable[dict[str, Any]]) -> Iterator[tuple[str, dict[str, Any]]]:
+    # Отдает пары (вид, запись) с видом "event" | "adaptation" | "session" по мере чтения строк;
+    # в памяти остаются только агрегаты сессий, которые выводятся из task_result и дописываются в конце.
     complete_sessions: set[tuple[str, str]] = set()
     inferred_sessions: dict[tuple[str, str], InferredSessionAgg] = {}
 
@@ -163,7 +209,7 @@ def transform_raw_events(
                 "deadline_met": int(payload.get("deadline_met", 0)),
                 "source_event_id": event_id,
             }
-            event_records.append(rec)
+            yield "event", rec
             if record_session_id and record_user_id:
                 key = (record_user_id, record_session_id)
                 agg = inferred_sessions.setdefault(
@@ -197,7 +243,7 @@ def transform_raw_events(
                 "task_offsets": _normalize_task_offsets(payload.get("task_offsets")),
                 "source_event_id": event_id,
             }
-            adaptation_records.append(rec)
+            yield "adaptation", rec
             continue
 
         if event_type in ("session_end", "session_end_partial"):
@@ -223,12 +269,60 @@ def transform_raw_events(
                 "timestamp": ts,
                 "source_event_id": event_id,
             }
-            session_records.append(rec)
+            yield "session", rec
             if record_session_id and record_user_id:
                 complete_sessions.add((record_user_id, record_session_id))
 
     for key, agg in inferred_sessions.items():
         if key not in complete_sessions:
-            session_records.append(agg.to_record())
+            yield "session", agg.to_record()
 
-    return event_records, adaptation_records, session_records
+
+def transform_raw_events(
+    rows: Iterable[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    records: dict[str, list[dict[str, Any]]] = {"event": [], "adaptation": [], "session": []}
+    for kind, rec in iter_transformed_events(rows):
+        records[kind].append(rec)
+    return records["event"], records["adaptation"], records["session"]
+
+
+def transform_raw_events_to_jsonl(
+    rows: Iterable[dict[str, Any]],
+    events_path: Path,
+    adaptations_path: Path,
+    sessions_path: Path,
+) -> tuple[int, int, int, int]:
+    # Потоковый вариант transform_raw_events: записи сразу уходят в JSONL. Файлы пишутся во
+    # временные и подменяются только после полного прохода, чтобы сбой выгрузки не оставил
+    # вместо прежних данных обрезанные.
+    paths = {"event": events_path, "adaptation": adaptations_path, "session": sessions_path}
+    tmp_paths = {kind: path.with_name(path.name + ".tmp") for kind, path in paths.items()}
+    counts = {kind: 0 for kind in paths}
+    raw_count = 0
+
+    def counted(source: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        nonlocal raw_count
+        for row in source:
+            raw_count += 1
+            yield row
+
+    files = {}
+    try:
+        for kind, tmp_path in tmp_paths.items():
+            tmp_path.parent.mkdir(parents=True, exist_ok=True)
+            files[kind] = tmp_path.open("wb")
+        for kind, rec in iter_transformed_events(counted(rows)):
+            files[kind].write(_jsonl_line(rec))
+            counts[kind] += 1
+    except BaseException:
+        for f in files.values():
+            f.close()
+        for tmp_path in tmp_paths.values():
+            tmp_path.unlink(missing_ok=True)
+        raise
+    for f in files.values():
+        f.close()
+    for kind, tmp_path in tmp_paths.items():
+        tmp_path.replace(paths[kind])
+    return raw_count, counts["event"], counts["adaptation"], counts["session"]
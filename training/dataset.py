@@ -1,18 +1,41 @@
 import json
+import os
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Версия формата кэша колонок: увеличивать при любом изменении build_transitions.
+_CACHE_VERSION = 1
+_CACHE_COLUMNS = ("states", "actions", "task_actions", "rewards", "next_states", "dones")
+
 
 @dataclass
-class Transition:
-    session_id: str
-    state: List[float]
-    action: int
-    task_actions: List[int]
-    reward: float
-    next_state: List[float]
-    done: bool
+class TransitionBatch:
+    # Переходы в виде колонок (SoA): каждый массив C-contiguous и отдается в torch.from_numpy без копии.
+    session_ids: List[str]
+    states: np.ndarray  # (N, D) float32
+    actions: np.ndarray  # (N,) int64
+    task_actions: np.ndarray  # (N, H) int64
+    rewards: np.ndarray  # (N,) float32
+    next_states: np.ndarray  # (N, D) float32
+    dones: np.ndarray  # (N,) float32
+
+    def __len__(self) -> int:
+        return len(self.session_ids)
+
+    @property
+    def state_dim(self) -> int:
+        return int(self.states.shape[1])
 
 
 def load_adaptations(path: str) -> List[dict]:
@@ -20,28 +43,46 @@ def load_adaptations(path: str) -> List[dict]:
     p = Path(path)
     if not p.exists():
         return records
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                records.append(json.loads(line))
+    # Файл читается одним read и режется на строки в C; orjson разбирает байты без промежуточной str.
+    for line in p.read_bytes().splitlines():
+        if not line or line.isspace():
+            continue
+        try:
+            records.append(_json_loads(line))
+        except ValueError:
+            # orjson строже stdlib (например, NaN/Infinity) — такие строки разбираем как раньше.
+            records.append(json.loads(line))
     records.sort(key=lambda r: (str(r.get("session_id", "")), int(r.get("step", 0))))
     return records
 
 
-def _same_episode(cur: dict, nxt: dict) -> bool:
-    cur_sid = cur.get("session_id")
-    nxt_sid = nxt.get("session_id")
-    if cur_sid and nxt_sid:
-        if cur_sid != nxt_sid:
-            return False
-        if cur.get("batch_index") is not None and nxt.get("batch_index") is not None:
-            return cur.get("batch_index") == nxt.get("batch_index")
-        return int(nxt.get("step", 0)) >= int(cur.get("step", 0))
+def _factorize(values: List[object]) -> np.ndarray:
+    codes: dict = {}
+    return np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int64, count=len(values))
 
+
+def _episode_continues(records: List[dict]) -> np.ndarray:
+    # continues[i] — продолжается ли эпизод записью i + 1; считается сразу для всех пар соседей.
+    n = len(records)
+    continues = np.zeros(n, dtype=bool)
+    if n < 2:
+        return continues
+    session_ids = [r.get("session_id") for r in records]
+    batch_indices = [r.get("batch_index") for r in records]
+    has_sid = np.fromiter((bool(sid) for sid in session_ids), dtype=bool, count=n)
+    has_batch = np.fromiter((b is not None for b in batch_indices), dtype=bool, count=n)
+    sid_codes = _factorize(session_ids)
+    batch_codes = _factorize(batch_indices)
+    steps = np.fromiter((int(r.get("step", 0)) for r in records), dtype=np.int64, count=n)
+
+    step_grows = steps[1:] >= steps[:-1]
+    both_sid = has_sid[:-1] & has_sid[1:]
+    both_batch = has_batch[:-1] & has_batch[1:]
+    same_sid = sid_codes[:-1] == sid_codes[1:]
+    same_batch = batch_codes[:-1] == batch_codes[1:]
     # Старые логи без session_id/batch_index: считаем эпизодом монотонную последовательность step.
-    cur_step = int(cur.get("step", 0))
-    nxt_step = int(nxt.get("step", 0))
-    return nxt_step >= cur_step
+    continues[:-1] = np.where(both_sid, same_sid & np.where(both_batch, same_batch, step_grows), step_grows)
+    return continues
 
 
 def _normalize_action_id(rec: dict) -> int | None:
@@ -101,11 +142,18 @@ def _task_actions_from_offsets(prev_offsets: dict, cur_offsets: dict) -> List[in
     return actions
 
 
-def build_transitions(records: List[dict], modes: Optional[set] = None) -> List[Transition]:
+def build_transitions(records: List[dict], modes: Optional[set] = None) -> TransitionBatch:
     if modes is not None:
         records = [r for r in records if r.get("mode") in modes]
-    transitions: List[Transition] = []
+    session_ids: List[str] = []
+    states: List[List[float]] = []
+    actions: List[int] = []
+    task_actions_rows: List[List[int]] = []
+    rewards: List[float] = []
+    next_states: List[List[float]] = []
+    dones: List[float] = []
     last_offsets_by_session: dict[str, dict] = {}
+    continues = _episode_continues(records)
     for i in range(len(records)):
         cur = records[i]
         state = cur.get("state")
@@ -122,7 +170,7 @@ def build_transitions(records: List[dict], modes: Optional[set] = None) -> List[
         if session_id:
             last_offsets_by_session[session_id] = cur_offsets
 
-        if i + 1 < len(records) and _same_episode(cur, records[i + 1]):
+        if continues[i]:
             nxt = records[i + 1]
             next_state = nxt.get("state", state)
             done = False
@@ -133,15 +181,85 @@ def build_transitions(records: List[dict], modes: Optional[set] = None) -> List[
         if not isinstance(next_state, list) or len(next_state) != len(state):
             next_state = state
 
-        transitions.append(
-            Transition(
-                session_id=session_id,
-                state=state,
-                action=int(action),
-                task_actions=task_actions,
-                reward=float(reward),
-                next_state=next_state,
-                done=done,
+        session_ids.append(session_id)
+        states.append(state)
+        actions.append(int(action))
+        task_actions_rows.append(task_actions)
+        rewards.append(float(reward))
+        next_states.append(next_state)
+        dones.append(1.0 if done else 0.0)
+
+    n = len(session_ids)
+    state_dim = len(states[0]) if n else 0
+    return TransitionBatch(
+        session_ids=session_ids,
+        states=np.asarray(states, dtype=np.float32).reshape(n, state_dim),
+        actions=np.asarray(actions, dtype=np.int64),
+        task_actions=np.asarray(task_actions_rows, dtype=np.int64).reshape(n, len(_task_keys())),
+        rewards=np.asarray(rewards, dtype=np.float32),
+        next_states=np.asarray(next_states, dtype=np.float32).reshape(n, state_dim),
+        dones=np.asarray(dones, dtype=np.float32),
+    )
+
+
+def _cache_path(p: Path, modes_tag: str) -> Path:
+    # Свой файл на каждый фильтр режимов: чередование --mode не перестраивает кэш каждый раз.
+    return p.with_name(f"{p.name}.{modes_tag}.cache.npz")
+
+
+def _cache_key(p: Path) -> np.ndarray:
+    st = p.stat()
+    return np.array([_CACHE_VERSION, st.st_mtime_ns, st.st_size], dtype=np.int64)
+
+
+def _modes_tag(modes: Optional[set]) -> str:
+    return "all" if modes is None else "+".join(sorted(modes))
+
+
+def _read_cache(cache: Path, key: np.ndarray, modes_tag: str) -> Optional[TransitionBatch]:
+    try:
+        with np.load(cache, allow_pickle=False) as data:
+            if not np.array_equal(data["_key"], key) or str(data["_modes"]) != modes_tag:
+                return None
+            return TransitionBatch(
+                session_ids=data["session_ids"].tolist(),
+                **{name: data[name] for name in _CACHE_COLUMNS},
             )
-        )
-    return transitions
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        # Обрезанный или пустой файл (прерванный запуск, полный диск) — просто промах кэша.
+        return None
+
+
+def _write_cache(cache: Path, key: np.ndarray, modes_tag: str, batch: TransitionBatch) -> None:
+    # У каждого процесса свой временный файл: ранги torchrun могут писать кэш одновременно.
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                _key=key,
+                _modes=np.array(modes_tag),
+                session_ids=np.array(batch.session_ids, dtype=str),
+                **{name: getattr(batch, name) for name in _CACHE_COLUMNS},
+            )
+        tmp.replace(cache)
+    except OSError:
+        # Кэш — только ускорение: каталог может быть только для чтения.
+        tmp.unlink(missing_ok=True)
+
+
+def load_transition_batch(path: str, modes: Optional[set] = None) -> TransitionBatch:
+    # Колонки переходов кэшируются рядом с JSONL по (mtime, size) файла и фильтру режимов:
+    # повторное обучение на неизмененных данных не разбирает JSON заново.
+    p = Path(path)
+    if not p.exists():
+        return build_transitions([], modes=modes)
+    key = _cache_key(p)
+    modes_tag = _modes_tag(modes)
+    cache = _cache_path(p, modes_tag)
+    batch = _read_cache(cache, key, modes_tag)
+    if batch is not None:
+        return batch
+    batch = build_transitions(load_adaptations(path), modes=modes)
+    _write_cache(cache, key, modes_tag, batch)
+    return batch
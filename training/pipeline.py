@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import subprocess
 import sys
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from urllib import error, parse, request
 
 from game.settings import SessionConfig
-from training.bridge_transform import to_jsonl, transform_raw_events
+from training.bridge_transform import transform_raw_events_to_jsonl
 
 
 @dataclass(frozen=True)
@@ -21,12 +25,14 @@ class PipelineConfig:
     model_out_path: str = SessionConfig().rl_model_path
     page_size: int = 1000
     max_pages: int = 10000
+    fetch_workers: int = 4
     train_mode: str = "all"  # "all" | "baseline" | "ppo"
     epochs: int = 40
     batch_size: int = 64
     gamma: float = 0.97
     lr: float = 3e-4
     skip_train: bool = False
+    train_subprocess: bool = False  # отдельный процесс изолирует падения torch ценой повторного запуска
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
@@ -65,41 +71,91 @@ def _join_base(base: str, path: str) -> str:
     return f"{base}{path}"
 
 
+def _decode_body(body: bytes, content_encoding: str) -> bytes:
+    encoding = content_encoding.strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Часть серверов шлет deflate без zlib-заголовка.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
 def _http_get_json(url: str, timeout_sec: float = 10.0) -> dict[str, Any]:
-    req = request.Request(url, method="GET")
+    # Страницы выгрузки — повторяющийся JSON, который сжимается в разы: просим gzip/deflate.
+    req = request.Request(url, headers={"Accept-Encoding": "gzip, deflate"}, method="GET")
     with request.urlopen(req, timeout=timeout_sec) as resp:
         if resp.status != 200:
             raise RuntimeError(f"http_status_{resp.status}")
-        raw = resp.read().decode("utf-8") or "{}"
+        body = _decode_body(resp.read(), resp.headers.get("Content-Encoding", ""))
+        raw = body.decode("utf-8") or "{}"
         data = json.loads(raw)
         if not isinstance(data, dict):
             raise RuntimeError("invalid_json_payload")
         return data
 
 
-def fetch_all_rows(server: str, api_key: str, page_size: int, max_pages: int) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    offset = 0
+def _fetch_page(server: str, api_key: str, limit: int, offset: int) -> list[dict[str, Any]]:
+    query = parse.urlencode({"api_key": api_key, "limit": limit, "offset": offset})
+    url = _join_base(server, f"/v1/export/raw?{query}")
+    payload = _http_get_json(url)
+    if payload.get("ok") is not True:
+        raise RuntimeError("server_export_failed")
+    page_rows = payload.get("rows", [])
+    if not isinstance(page_rows, list):
+        raise RuntimeError("server_rows_not_list")
+    return [r for r in page_rows if isinstance(r, dict)]
+
+
+def iter_all_rows(
+    server: str, api_key: str, page_size: int, max_pages: int, workers: int = 4
+) -> Iterator[dict[str, Any]]:
     safe_page_size = max(1, min(5000, int(page_size)))
     safe_max_pages = max(1, int(max_pages))
+    safe_workers = max(1, int(workers))
+
+    # Сервер не отдает общее число строк: держим в полете до workers следующих страниц и
+    # разбираем ответы строго по порядку до первой неполной страницы. Лишние запросы в хвосте
+    # возвращают пустые страницы и отбрасываются.
+    # Строки отдаются потребителю постранично, пока следующие страницы еще загружаются.
+    pending: deque[Future] = deque()
+    next_page = 0
+    with ThreadPoolExecutor(max_workers=safe_workers) as pool:
+        try:
+            while True:
+                while len(pending) < safe_workers and next_page < safe_max_pages:
+                    offset = next_page * safe_page_size
+                    pending.append(pool.submit(_fetch_page, server, api_key, safe_page_size, offset))
+                    next_page += 1
+                if not pending:
+                    break
+                page_rows = pending.popleft().result()
+                if not page_rows:
+                    break
+                yield from page_rows
+                if len(page_rows) < safe_page_size:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _fail_on_fetch_error(rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    # Ошибки выгрузки превращаются в выход прямо в генераторе строк: так они не смешиваются
+    # с ошибками записи локальных файлов, которые происходят вне его.
+    try:
+        yield from rows
+    except (error.URLError, error.HTTPError, TimeoutError, OSError, json.JSONDecodeError, zlib.error) as exc:
+        raise SystemExit(f"Fetch failed: {exc}")
+
 
-    for _ in range(safe_max_pages):
-        query = parse.urlencode({"api_key": api_key, "limit": safe_page_size, "offset": offset})
-        url = _join_base(server, f"/v1/export/raw?{query}")
-        payload = _http_get_json(url)
-        if payload.get("ok") is not True:
-            raise RuntimeError("server_export_failed")
-        page_rows = payload.get("rows", [])
-        if not isinstance(page_rows, list):
-            raise RuntimeError("server_rows_not_list")
-        page_rows = [r for r in page_rows if isinstance(r, dict)]
-        if not page_rows:
-            break
-        rows.extend(page_rows)
-        offset += len(page_rows)
-        if len(page_rows) < safe_page_size:
-            break
-    return rows
+def fetch_all_rows(
+    server: str, api_key: str, page_size: int, max_pages: int, workers: int = 4
+) -> list[dict[str, Any]]:
+    return list(iter_all_rows(server, api_key, page_size, max_pages, workers=workers))
 
 
 def run_train(
@@ -110,11 +166,9 @@ def run_train(
     batch_size: int,
     gamma: float,
     lr: float,
+    subprocess_mode: bool = False,
 ) -> None:
-    cmd = [
-        sys.executable,
-        "-m",
-        "training.train",
+    argv = [
         "--data",
         str(data_path),
         "--out",
@@ -130,7 +184,13 @@ def run_train(
         "--lr",
         str(lr),
     ]
-    subprocess.run(cmd, check=True)
+    if subprocess_mode:
+        subprocess.run([sys.executable, "-m", "training.train", *argv], check=True)
+        return
+    # torch импортируется только здесь: без обучения пайплайн обходится без него.
+    from training.train import main as train_main
+
+    train_main(argv)
 
 
 def main() -> None:
@@ -141,27 +201,28 @@ def main() -> None:
         out_dir = PROJECT_ROOT / out_dir
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    try:
-        rows = fetch_all_rows(
-            server=cfg.server,
-            api_key=cfg.api_key,
-            page_size=cfg.page_size,
-            max_pages=cfg.max_pages,
-        )
-    except (error.URLError, error.HTTPError, TimeoutError, OSError, json.JSONDecodeError) as exc:
-        raise SystemExit(f"Fetch failed: {exc}")
-
-    events, adaptations, sessions = transform_raw_events(rows)
     events_path = out_dir / "events.jsonl"
     adaptations_path = out_dir / "adaptations.jsonl"
     sessions_path = out_dir / "sessions.jsonl"
-    to_jsonl(events_path, events)
-    to_jsonl(adaptations_path, adaptations)
-    to_jsonl(sessions_path, sessions)
+    rows = iter_all_rows(
+        server=cfg.server,
+        api_key=cfg.api_key,
+        page_size=cfg.page_size,
+        max_pages=cfg.max_pages,
+        workers=cfg.fetch_workers,
+    )
+    # Выгрузка и разбор идут потоком: страницы сразу преобразуются и пишутся в JSONL.
+    # Ошибки загрузки сообщаются из генератора строк, здесь остаются только ошибки записи.
+    try:
+        raw_count, events_count, adaptations_count, sessions_count = transform_raw_events_to_jsonl(
+            _fail_on_fetch_error(rows), events_path, adaptations_path, sessions_path
+        )
+    except OSError as exc:
+        raise SystemExit(f"Write failed: {exc}")
 
     print(
         "Prepared dataset: "
-        f"raw={len(rows)}, events={len(events)}, adaptations={len(adaptations)}, sessions={len(sessions)}"
+        f"raw={raw_count}, events={events_count}, adaptations={adaptations_count}, sessions={sessions_count}"
     )
     print(f"Saved: {events_path}")
     print(f"Saved: {adaptations_path}")
@@ -181,6 +242,7 @@ def main() -> None:
         batch_size=cfg.batch_size,
         gamma=cfg.gamma,
         lr=cfg.lr,
+        subprocess_mode=cfg.train_subprocess,
     )
 
 
@@ -0,0 +1,167 @@
+import math
+
+import numpy as np
+
+from training.model import ActorCritic
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = logits - logits.max(axis=-1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=-1, keepdims=True)
+    return z
+
+
+def _log_sum_exp(logits: np.ndarray) -> np.ndarray:
+    m = logits.max(axis=-1)
+    return m + np.log(np.exp(logits - m[..., None]).sum(axis=-1))
+
+
+def _numpy_views(params) -> list[np.ndarray]:
+    # Представления numpy делят память с параметрами torch: шаг обновляет модель на месте,
+    # и валидация, state_dict и сохранение работают без изменений.
+    return [p.detach().numpy() for p in params]
+
+
+def _q_params(model: ActorCritic) -> list[np.ndarray]:
+    # Голова value в лоссе не участвует: обучаются только shared и policy, как и в torch-цикле.
+    return _numpy_views(
+        (
+            model.shared[0].weight,
+            model.shared[0].bias,
+            model.shared[2].weight,
+            model.shared[2].bias,
+            model.policy.weight,
+            model.policy.bias,
+        )
+    )
+
+
+# Шаг обучения ActorCritic на CPU без autograd: прямой и обратный проход, clip и Adam на numpy.
+# Повторяет шаг torch-цикла из train.py (TD smooth L1 + CQL + взвешенный CE голов задач,
+# clip_grad_norm_ и Adam с параметрами по умолчанию) для фиксированной архитектуры training.model.
+class SpecializedCQLStep:
+    def __init__(
+        self,
+        model: ActorCritic,
+        target_model: ActorCritic,
+        lr: float,
+        gamma: float,
+        cql_alpha: float,
+        target_tau: float,
+        task_heads: int,
+        max_norm: float = 5.0,
+        betas: tuple[float, float] = (0.9, 0.999),
+        eps: float = 1e-8,
+    ) -> None:
+        self.lr = lr
+        self.gamma = gamma
+        self.cql_alpha = cql_alpha
+        self.target_tau = target_tau
+        self.task_heads = task_heads
+        self.max_norm = max_norm
+        self.beta1, self.beta2 = betas
+        self.eps = eps
+        self.params = _q_params(model)
+        self.target_params = _q_params(target_model)
+        self.all_params = _numpy_views(model.parameters())
+        self.all_target_params = _numpy_views(target_model.parameters())
+        self.exp_avg = [np.zeros_like(p) for p in self.params]
+        self.exp_avg_sq = [np.zeros_like(p) for p in self.params]
+        self.steps = 0
+
+    @staticmethod
+    def _q_values(params: list[np.ndarray], x: np.ndarray) -> np.ndarray:
+        w1, b1, w2, b2, wp, bp = params
+        h = _relu(x @ w1.T + b1)
+        h = _relu(h @ w2.T + b2)
+        return h @ wp.T + bp
+
+    def __call__(
+        self,
+        s: np.ndarray,
+        a: np.ndarray,
+        ta: np.ndarray,
+        r: np.ndarray,
+        ns: np.ndarray,
+        d: np.ndarray,
+    ) -> tuple[float, float, float, float]:
+        w1, b1, w2, b2, wp, bp = self.params
+        batch = s.shape[0]
+        rows = np.arange(batch)
+
+        h1 = _relu(s @ w1.T + b1)
+        h2 = _relu(h1 @ w2.T + b2)
+        q_all = h2 @ wp.T + bp
+        q = q_all[:, :3]
+        next_v = self._q_values(self.target_params, ns)[:, :3].max(axis=1)
+        td_target = r + self.gamma * next_v * (1.0 - d)
+
+        q_taken = q[rows, a]
+        diff = q_taken - td_target
+        abs_diff = np.abs(diff)
+        small = abs_diff < 1.0
+        td_loss = float(np.where(small, 0.5 * diff * diff, abs_diff - 0.5).mean())
+        cql_loss = float((_log_sum_exp(q) - q_taken).mean())
+
+        grad_q = np.zeros_like(q_all)
+        # d(CQL)/dQ = softmax(Q) - onehot(a), d(TD)/dQ[a] — производная smooth L1.
+        grad_q[:, :3] = self.cql_alpha * _softmax(q.copy())
+        grad_q[rows, a] += np.where(small, diff, np.sign(diff)) - self.cql_alpha
+        grad_q /= batch
+
+        task_loss = 0.0
+        if self.task_heads > 0:
+            heads = self.task_heads
+            head_logits = q_all[:, 3 : 3 + heads * 3].reshape(batch, heads, 3)
+            weight = 1.0 + np.clip(r, -0.5, 1.5)
+            picked = np.take_along_axis(head_logits, ta[:, :, None], axis=2)[:, :, 0]
+            ce = _log_sum_exp(head_logits) - picked
+            task_loss = float((ce * weight[:, None]).mean())
+            grad_heads = _softmax(head_logits.copy())
+            np.put_along_axis(
+                grad_heads,
+                ta[:, :, None],
+                np.take_along_axis(grad_heads, ta[:, :, None], axis=2) - 1.0,
+                axis=2,
+            )
+            grad_heads *= (0.25 / (batch * heads)) * weight[:, None, None]
+            grad_q[:, 3 : 3 + heads * 3] = grad_heads.reshape(batch, heads * 3)
+        loss = td_loss + self.cql_alpha * cql_loss + 0.25 * task_loss
+
+        grad_h2 = (grad_q @ wp) * (h2 > 0)
+        grad_h1 = (grad_h2 @ w2) * (h1 > 0)
+        grads = [
+            grad_h1.T @ s,
+            grad_h1.sum(axis=0),
+            grad_h2.T @ h1,
+            grad_h2.sum(axis=0),
+            grad_q.T @ h2,
+            grad_q.sum(axis=0),
+        ]
+
+        total_norm = float(np.sqrt(sum(float(np.dot(g.ravel(), g.ravel())) for g in grads)))
+        clip_coef = min(1.0, self.max_norm / (total_norm + 1e-6))
+
+        self.steps += 1
+        bias1 = 1.0 - self.beta1 ** self.steps
+        bias2_sqrt = math.sqrt(1.0 - self.beta2 ** self.steps)
+        step_size = self.lr / bias1
+        for param, grad, exp_avg, exp_avg_sq in zip(self.params, grads, self.exp_avg, self.exp_avg_sq):
+            if clip_coef < 1.0:
+                grad *= clip_coef
+            exp_avg *= self.beta1
+            exp_avg += (1.0 - self.beta1) * grad
+            exp_avg_sq *= self.beta2
+            exp_avg_sq += (1.0 - self.beta2) * grad * grad
+            param -= step_size * exp_avg / (np.sqrt(exp_avg_sq) / bias2_sqrt + self.eps)
+
+        tau = self.target_tau
+        for target_param, param in zip(self.all_target_params, self.all_params):
+            target_param *= 1.0 - tau
+            target_param += tau * param
+        return loss, td_loss, cql_loss, task_loss
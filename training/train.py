@@ -1,19 +1,23 @@
 import argparse
 import json
 import math
+import os
 from pathlib import Path
 
 import torch
+import torch.distributed as dist
 import torch.nn.functional as F
+from torch.nn.parallel import DistributedDataParallel
 
 from game.settings import SessionConfig
-from training.dataset import build_transitions, load_adaptations
+from training.dataset import load_transition_batch
 from training.model import ActorCritic
+from training.specialized import SpecializedCQLStep
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
-def parse_args():
+def parse_args(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Train offline tempo policy from adaptations.jsonl (CQL-style)")
     parser.add_argument("--data", default="training/data/adaptations.jsonl")
     parser.add_argument("--out", default=SessionConfig().rl_model_path)
@@ -24,7 +28,34 @@ def parse_args():
     parser.add_argument("--mode", choices=["all", "baseline", "ppo"], default="all")
     parser.add_argument("--cql-alpha", type=float, default=1.0)
     parser.add_argument("--target-tau", type=float, default=0.02)
-    return parser.parse_args()
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Run forward passes through torch.compile (first epoch pays the compilation cost)",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["none", "int8", "fp16"],
+        default="none",
+        help="Store the policy as dynamic int8 Linear layers or FP16 weights for the game client",
+    )
+    parser.add_argument(
+        "--specialize",
+        action="store_true",
+        help="Single-process CPU only: train with hand-written numpy forward/backward instead of autograd",
+    )
+    parser.add_argument("--device", default="cpu", help="Training device for single-process runs, e.g. cpu or cuda:0")
+    parser.add_argument(
+        "--cuda-graph",
+        action="store_true",
+        help="Single-process CUDA only: capture the train step in a CUDA graph (drops the last partial batch)",
+    )
+    parser.add_argument(
+        "--distributed",
+        action="store_true",
+        help="DistributedDataParallel mode; launch via torchrun --nproc_per_node=N -m training.train --distributed",
+    )
+    return parser.parse_args(argv)
 
 
 def _resolve_path(path: str) -> Path:
@@ -34,17 +65,63 @@ def _resolve_path(path: str) -> Path:
     return PROJECT_ROOT / p
 
 
-def _build_session_split(transitions: list, val_ratio: float = 0.15) -> tuple[torch.Tensor, torch.Tensor]:
-    session_ids = sorted({str(t.session_id or "") for t in transitions})
-    if len(session_ids) < 2:
-        idx = torch.arange(len(transitions), dtype=torch.int64)
+def _init_distributed() -> tuple[int, int, torch.device]:
+    # Один процесс на GPU (nccl); без CUDA ранги работают на CPU через gloo.
+    if torch.cuda.is_available():
+        local_rank = int(os.environ["LOCAL_RANK"])
+        torch.cuda.set_device(local_rank)
+        dist.init_process_group("nccl")
+        device = torch.device("cuda", local_rank)
+    else:
+        dist.init_process_group("gloo")
+        device = torch.device("cpu")
+    return dist.get_rank(), dist.get_world_size(), device
+
+
+def _shard_indices(train_idx: torch.Tensor, epoch: int, rank: int, world_size: int) -> torch.Tensor:
+    # Как DistributedSampler(shuffle=True): общая для всех рангов перестановка с сидом по эпохе,
+    # дополненная повтором до кратной world_size длины, чтобы у рангов было равное число шагов.
+    generator = torch.Generator()
+    generator.manual_seed(epoch)
+    order = torch.randperm(int(train_idx.numel()), generator=generator)
+    perm = train_idx[order.to(train_idx.device)]
+    total = int(math.ceil(perm.numel() / world_size)) * world_size
+    if total > perm.numel():
+        perm = perm.repeat(int(math.ceil(total / perm.numel())))[:total]
+    return perm[rank:total:world_size]
+
+
+def _to_device(tensor: torch.Tensor, device: torch.device) -> torch.Tensor:
+    if device.type != "cuda":
+        return tensor.to(device)
+    # Копия из закрепленной памяти идет асинхронно и не блокирует хост на время загрузки.
+    return tensor.pin_memory().to(device, non_blocking=True)
+
+
+def _export_state_dict(model: ActorCritic, state_dict: dict, quantize: str) -> dict:
+    if quantize == "fp16":
+        # Игра загружает веса в FP32-модель: load_state_dict сам приведет тип при копировании.
+        return {k: v.detach().cpu().half() for k, v in state_dict.items()}
+    if quantize == "int8":
+        model = model.cpu()
+        model.load_state_dict(state_dict)
+        model.eval()
+        qmodel = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return qmodel.state_dict()
+    return state_dict
+
+
+def _build_session_split(session_ids: list, val_ratio: float = 0.15) -> tuple[torch.Tensor, torch.Tensor]:
+    unique_ids = sorted({str(sid or "") for sid in session_ids})
+    if len(unique_ids) < 2:
+        idx = torch.arange(len(session_ids), dtype=torch.int64)
         return idx, idx[:0]
-    val_count = max(1, int(math.ceil(len(session_ids) * val_ratio)))
-    val_sessions = set(session_ids[-val_count:])
-    train_idx = [i for i, t in enumerate(transitions) if str(t.session_id or "") not in val_sessions]
-    val_idx = [i for i, t in enumerate(transitions) if str(t.session_id or "") in val_sessions]
+    val_count = max(1, int(math.ceil(len(unique_ids) * val_ratio)))
+    val_sessions = set(unique_ids[-val_count:])
+    train_idx = [i for i, sid in enumerate(session_ids) if str(sid or "") not in val_sessions]
+    val_idx = [i for i, sid in enumerate(session_ids) if str(sid or "") in val_sessions]
     if not train_idx or not val_idx:
-        idx = torch.arange(len(transitions), dtype=torch.int64)
+        idx = torch.arange(len(session_ids), dtype=torch.int64)
         return idx, idx[:0]
     return torch.tensor(train_idx, dtype=torch.int64), torch.tensor(val_idx, dtype=torch.int64)
 
@@ -59,13 +136,58 @@ def _normalize_states(states: torch.Tensor, next_states: torch.Tensor, train_idx
     return norm_states, norm_next_states, mean, std
 
 
+def _task_weights(rewards: torch.Tensor) -> torch.Tensor:
+    return 1.0 + torch.clamp(rewards, min=-0.5, max=1.5)
+
+
+def _task_loss(q_values_all: torch.Tensor, ta: torch.Tensor, task_weight: torch.Tensor, task_heads: int) -> torch.Tensor:
+    if task_heads <= 0:
+        return q_values_all.new_zeros(())
+    # Все головы задач считаются одним cross_entropy по (B * heads, 3) вместо цикла по головам;
+    # среднее по батчу и головам равно прежней сумме средних, деленной на число голов.
+    head_logits = q_values_all[:, 3 : 3 + task_heads * 3].reshape(-1, 3)
+    ce = F.cross_entropy(head_logits, ta.reshape(-1), reduction="none").view(-1, task_heads)
+    return torch.mean(ce * task_weight.unsqueeze(1))
+
+
+class _GraphedTrainStep:
+    # Шаг обучения, записанный в CUDA graph. Первые шаги идут обычным путем на отдельном потоке
+    # (прогрев аллокатора, cuBLAS и ленивое состояние Adam), затем шаг захватывается один раз и
+    # дальше только воспроизводится: новые индексы батча копируются в статический буфер.
+    def __init__(self, step, batch_size: int, device: torch.device, warmup_steps: int = 3) -> None:
+        self.step = step
+        self.idx = torch.zeros(batch_size, dtype=torch.int64, device=device)
+        self.warmup_left = warmup_steps
+        self.stream = torch.cuda.Stream(device)
+        self.graph = None
+
+    def __call__(self, idx: torch.Tensor) -> None:
+        self.idx.copy_(idx)
+        if self.graph is not None:
+            self.graph.replay()
+            return
+        if self.warmup_left > 0:
+            self.warmup_left -= 1
+            self.stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(self.stream):
+                self.step(self.idx)
+            torch.cuda.current_stream().wait_stream(self.stream)
+            return
+        # Захват только записывает ядра, поэтому сразу после него шаг воспроизводится для этого батча.
+        self.graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self.graph):
+            self.step(self.idx)
+        self.graph.replay()
+
+
 def _evaluate_epoch(
-    model: ActorCritic,
-    target_model: ActorCritic,
+    model: torch.nn.Module,
+    target_model: torch.nn.Module,
     states: torch.Tensor,
     actions: torch.Tensor,
     task_actions: torch.Tensor,
     rewards: torch.Tensor,
+    task_weights: torch.Tensor,
     next_states: torch.Tensor,
     dones: torch.Tensor,
     idx: torch.Tensor,
@@ -89,118 +211,213 @@ def _evaluate_epoch(
         td_target = r + gamma * next_v * (1.0 - d)
         q_taken = q_values.gather(1, a.unsqueeze(1)).squeeze(1)
         td_loss = F.smooth_l1_loss(q_taken, td_target)
-        cql_loss = torch.logsumexp(q_values, dim=1).mean() - q_taken.mean()
+        cql_loss = F.cross_entropy(q_values, a)
         task_heads = int(task_actions.size(1)) if task_actions.ndim == 2 else 0
-        task_loss = torch.tensor(0.0, dtype=torch.float32)
-        if task_heads > 0:
-            reward_weight = 1.0 + torch.clamp(r, min=-0.5, max=1.5)
-            for head_idx in range(task_heads):
-                start_col = 3 + (head_idx * 3)
-                end_col = start_col + 3
-                head_logits = q_values_all[:, start_col:end_col]
-                ce = F.cross_entropy(head_logits, ta[:, head_idx], reduction="none")
-                task_loss = task_loss + torch.mean(ce * reward_weight)
-            task_loss = task_loss / task_heads
+        task_loss = _task_loss(q_values_all, ta, task_weights[idx], task_heads)
         loss = td_loss + (cql_alpha * cql_loss) + (0.25 * task_loss)
         return float(loss.item()), float(td_loss.item()), float(cql_loss.item()), float(task_loss.item())
 
 
-def main():
-    args = parse_args()
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    rank, world_size, device = 0, 1, torch.device(args.device)
+    if args.distributed:
+        rank, world_size, device = _init_distributed()
+    is_main = rank == 0
+    if args.specialize and (args.distributed or device.type != "cpu"):
+        raise SystemExit("--specialize supports only single-process CPU training")
+    if args.cuda_graph and (args.distributed or device.type != "cuda" or args.compile or args.specialize):
+        raise SystemExit("--cuda-graph supports only single-process CUDA training without --compile/--specialize")
     data_path = _resolve_path(args.data)
     out_path = _resolve_path(args.out)
-    records = load_adaptations(str(data_path))
     modes = None if args.mode == "all" else {args.mode}
-    transitions = build_transitions(records, modes=modes)
-    if not transitions:
-        print(f"No adaptations found at {data_path}. Play the game to generate data.")
+    batch = load_transition_batch(str(data_path), modes=modes)
+    if not batch:
+        if is_main:
+            print(f"No adaptations found at {data_path}. Play the game to generate data.")
+        if args.distributed:
+            dist.destroy_process_group()
         return
 
-    state_dim = len(transitions[0].state)
+    state_dim = batch.state_dim
 
-    states = torch.tensor([t.state for t in transitions], dtype=torch.float32)
-    actions = torch.tensor([t.action for t in transitions], dtype=torch.int64)
-    task_actions = torch.tensor([t.task_actions for t in transitions], dtype=torch.int64)
-    rewards = torch.tensor([t.reward for t in transitions], dtype=torch.float32)
-    next_states = torch.tensor([t.next_state for t in transitions], dtype=torch.float32)
-    dones = torch.tensor([1.0 if t.done else 0.0 for t in transitions], dtype=torch.float32)
-    train_idx, val_idx = _build_session_split(transitions)
+    states = torch.from_numpy(batch.states)
+    actions = torch.from_numpy(batch.actions)
+    task_actions = torch.from_numpy(batch.task_actions)
+    rewards = torch.from_numpy(batch.rewards)
+    next_states = torch.from_numpy(batch.next_states)
+    dones = torch.from_numpy(batch.dones)
+    train_idx, val_idx = _build_session_split(batch.session_ids)
     states, next_states, state_mean, state_std = _normalize_states(states, next_states, train_idx)
+    if device.type != "cpu":
+        # Весь набор переходов помещается на устройство целиком: загружаем его один раз,
+        # и батчи выбираются индексами уже на GPU без копий H2D на каждом шаге.
+        states, next_states = _to_device(states, device), _to_device(next_states, device)
+        actions, task_actions = _to_device(actions, device), _to_device(task_actions, device)
+        rewards, dones = _to_device(rewards, device), _to_device(dones, device)
+        train_idx, val_idx = _to_device(train_idx, device), _to_device(val_idx, device)
     task_heads = int(task_actions.size(1)) if task_actions.ndim == 2 else 0
     action_dim = 3 + (task_heads * 3)
-    model = ActorCritic(state_dim, action_dim)
-    target_model = ActorCritic(state_dim, action_dim)
+    model = ActorCritic(state_dim, action_dim).to(device)
+    target_model = ActorCritic(state_dim, action_dim).to(device)
     target_model.load_state_dict(model.state_dict())
     target_model.eval()
-    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+    try:
+        # Fused Adam обновляет все тензоры параметров одним ядром вместо набора поэлементных.
+        # capturable держит счетчик шагов на устройстве, без чего step() нельзя записать в CUDA graph.
+        optimizer = torch.optim.Adam(model.parameters(), lr=args.lr, fused=True, capturable=args.cuda_graph)
+    except RuntimeError:
+        # Для CPU fused-реализация есть только в torch >= 2.4.
+        optimizer = torch.optim.Adam(model.parameters(), lr=args.lr, capturable=args.cuda_graph)
+    forward = model
+    target_forward = target_model
+    if args.distributed:
+        # DDP усредняет градиенты между рангами в backward; целевая сеть обновляется
+        # из синхронизированных весов и после общей стартовой копии одинакова на всех рангах.
+        # Голова value в офлайн-лоссе не участвует и градиента не получает. Без флагов DDP ждал бы
+        # ее редукции вечно, а find_unused_parameters ее не находит: value — выход forward, и обход
+        # графа считает голову использованной. Замороженные параметры DDP просто не синхронизирует.
+        model.value.requires_grad_(False)
+        forward = DistributedDataParallel(
+            model,
+            device_ids=[device.index] if device.type == "cuda" else None,
+        )
+        # Обертка рассылает веса ранга 0 в model; целевую сеть копируем заново уже из них,
+        # иначе каждый ранг считал бы TD-цели по своей случайной инициализации.
+        target_model.load_state_dict(model.state_dict())
+    if args.compile:
+        # Веса, state_dict и шаги оптимизатора остаются на исходных модулях: у скомпилированной
+        # обертки ключи state_dict получают префикс _orig_mod. и не загрузились бы в игре.
+        torch.set_float32_matmul_precision("high")
+        compile_mode = "reduce-overhead" if states.device.type == "cuda" else "default"
+        forward = torch.compile(forward, mode=compile_mode, fullgraph=not args.distributed)
+        target_forward = torch.compile(target_model, mode=compile_mode, fullgraph=True)
+    # Колонки батча упакованы в два тензора (float и int64): на шаг две выборки по индексам вместо шести.
+    # Вес CE голов задач зависит только от награды перехода: считается один раз на весь набор.
+    task_weights = _task_weights(rewards)
+    float_cols = torch.cat(
+        [states, next_states, rewards.unsqueeze(1), dones.unsqueeze(1), task_weights.unsqueeze(1)],
+        dim=1,
+    )
+    int_cols = torch.cat([actions.unsqueeze(1), task_actions], dim=1)
+    ns_end = 2 * state_dim
+    specialized_step = None
+    if args.specialize:
+        # Колонки делят память с numpy; шаг обновляет веса model и target_model на месте.
+        float_np = float_cols.numpy()
+        int_np = int_cols.numpy()
+        specialized_step = SpecializedCQLStep(
+            model,
+            target_model,
+            lr=args.lr,
+            gamma=args.gamma,
+            cql_alpha=args.cql_alpha,
+            target_tau=args.target_tau,
+            task_heads=task_heads,
+        )
+
+    # Суммы total/td/cql/task копятся на устройстве: без .item() на каждом шаге
+    # хост не ждет GPU, и синхронизация остается одна на эпоху.
+    # float32, а не float64: на части устройств (например, MPS) float64 не поддерживается.
+    epoch_sums = torch.zeros(4, dtype=torch.float32, device=device)
+
+    def train_step(idx: torch.Tensor) -> None:
+        fb = float_cols[idx]
+        ib = int_cols[idx]
+        s = fb[:, :state_dim]
+        ns = fb[:, state_dim:ns_end]
+        r = fb[:, ns_end]
+        d = fb[:, ns_end + 1]
+        w = fb[:, ns_end + 2]
+        a = ib[:, 0]
+        ta = ib[:, 1:]
+
+        q_values_all, _ = forward(s)
+        q_values = q_values_all[:, :3]
+        with torch.no_grad():
+            q_next_all, _ = target_forward(ns)
+            q_next = q_next_all[:, :3]
+            next_v = q_next.max(dim=1).values
+            td_target = r + args.gamma * next_v * (1.0 - d)
+
+        q_taken = q_values.gather(1, a.unsqueeze(1)).squeeze(1)
+        td_loss = F.smooth_l1_loss(q_taken, td_target)
+        # CQL-штраф mean(logsumexp(Q) - Q[a]) совпадает с cross_entropy по Q как по логитам: одно ядро вместо трех.
+        cql_loss = F.cross_entropy(q_values, a)
+        task_loss = _task_loss(q_values_all, ta, w, task_heads)
+        loss = td_loss + (args.cql_alpha * cql_loss) + (0.25 * task_loss)
+
+        optimizer.zero_grad(set_to_none=True)
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=5.0)
+        optimizer.step()
+
+        with torch.no_grad():
+            for target_param, param in zip(target_model.parameters(), model.parameters()):
+                target_param.mul_(1.0 - args.target_tau).add_(args.target_tau * param)
+
+        epoch_sums.add_(torch.stack((loss, td_loss, cql_loss, task_loss)).detach())
+
     best_metric = float("inf")
     best_state_dict = None
     n = int(train_idx.numel())
+    step_batch = args.batch_size
+    step_fn = train_step
+    if args.cuda_graph:
+        # Граф записан под фиксированную форму батча: хвост эпохи короче batch_size отбрасывается
+        # (перестановка новая каждую эпоху, так что пропускаются разные переходы).
+        step_batch = max(1, min(args.batch_size, n))
+        step_fn = _GraphedTrainStep(train_step, step_batch, device)
     for epoch in range(args.epochs):
-        perm = train_idx[torch.randperm(n)]
-        epoch_loss = 0.0
-        epoch_td_loss = 0.0
-        epoch_cql_loss = 0.0
-        epoch_task_loss = 0.0
+        if args.distributed:
+            perm = _shard_indices(train_idx, epoch, rank, world_size)
+        else:
+            # Перестановка строится прямо на устройстве: индексы батчей не копируются с хоста.
+            perm = train_idx[torch.randperm(n, device=device)]
+        epoch_sums.zero_()
         batches = 0
-        for start in range(0, n, args.batch_size):
-            idx = perm[start : start + args.batch_size]
-            s = states[idx]
-            a = actions[idx]
-            ta = task_actions[idx]
-            r = rewards[idx]
-            ns = next_states[idx]
-            d = dones[idx]
-
-            q_values_all, _ = model(s)
-            q_values = q_values_all[:, :3]
-            with torch.no_grad():
-                q_next_all, _ = target_model(ns)
-                q_next = q_next_all[:, :3]
-                next_v = q_next.max(dim=1).values
-                td_target = r + args.gamma * next_v * (1.0 - d)
-
-            q_taken = q_values.gather(1, a.unsqueeze(1)).squeeze(1)
-            td_loss = F.smooth_l1_loss(q_taken, td_target)
-            cql_loss = torch.logsumexp(q_values, dim=1).mean() - q_taken.mean()
-            task_loss = torch.tensor(0.0, dtype=torch.float32)
-            if task_heads > 0:
-                reward_weight = 1.0 + torch.clamp(r, min=-0.5, max=1.5)
-                for head_idx in range(task_heads):
-                    start_col = 3 + (head_idx * 3)
-                    end_col = start_col + 3
-                    head_logits = q_values_all[:, start_col:end_col]
-                    ce = F.cross_entropy(head_logits, ta[:, head_idx], reduction="none")
-                    task_loss = task_loss + torch.mean(ce * reward_weight)
-                task_loss = task_loss / task_heads
-            loss = td_loss + (args.cql_alpha * cql_loss) + (0.25 * task_loss)
-
-            optimizer.zero_grad()
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=5.0)
-            optimizer.step()
-
-            with torch.no_grad():
-                for target_param, param in zip(target_model.parameters(), model.parameters()):
-                    target_param.mul_(1.0 - args.target_tau).add_(args.target_tau * param)
-
-            epoch_loss += float(loss.item())
-            epoch_td_loss += float(td_loss.item())
-            epoch_cql_loss += float(cql_loss.item())
-            epoch_task_loss += float(task_loss.item())
+        stop = int(perm.numel())
+        if args.cuda_graph:
+            stop -= stop % step_batch
+        for start in range(0, stop, step_batch):
+            idx = perm[start : start + step_batch]
+            if specialized_step is not None:
+                idx_np = idx.numpy()
+                fb_np = float_np[idx_np]
+                ib_np = int_np[idx_np]
+                step_losses = specialized_step(
+                    fb_np[:, :state_dim],
+                    ib_np[:, 0],
+                    ib_np[:, 1:],
+                    fb_np[:, ns_end],
+                    fb_np[:, state_dim:ns_end],
+                    fb_np[:, ns_end + 1],
+                )
+                epoch_sums.add_(torch.tensor(step_losses, dtype=torch.float32))
+                batches += 1
+                continue
+            step_fn(idx)
             batches += 1
 
+        sums = epoch_sums
+        if args.distributed:
+            totals = torch.cat([epoch_sums, epoch_sums.new_tensor([float(batches)])])
+            dist.all_reduce(totals)
+            sums = totals[:4]
+            batches = int(totals[4].item())
+        epoch_loss, epoch_td_loss, epoch_cql_loss, epoch_task_loss = sums.tolist()
         avg_loss = epoch_loss / max(1, batches)
         avg_td = epoch_td_loss / max(1, batches)
         avg_cql = epoch_cql_loss / max(1, batches)
         avg_task = epoch_task_loss / max(1, batches)
         val_total, val_td, val_cql, val_task = _evaluate_epoch(
-            model=model,
-            target_model=target_model,
+            model=model if args.distributed else forward,
+            target_model=target_forward,
             states=states,
             actions=actions,
             task_actions=task_actions,
             rewards=rewards,
+            task_weights=task_weights,
             next_states=next_states,
             dones=dones,
             idx=val_idx,
@@ -211,6 +428,8 @@ def main():
         if metric < best_metric:
             best_metric = metric
             best_state_dict = {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
+        if not is_main:
+            continue
         if val_idx.numel() > 0:
             print(
                 f"Epoch {epoch + 1} train_total={avg_loss:.4f} "
@@ -223,9 +442,13 @@ def main():
                 f"td={avg_td:.4f} cql={avg_cql:.4f} task={avg_task:.4f}"
             )
 
+    if args.distributed:
+        dist.destroy_process_group()
+    if not is_main:
+        return
     out_path.parent.mkdir(parents=True, exist_ok=True)
     final_state = best_state_dict or model.state_dict()
-    torch.save(final_state, str(out_path))
+    torch.save(_export_state_dict(model, final_state, args.quantize), str(out_path))
     meta_path = out_path.with_suffix(".meta.json")
     meta = {
         "state_dim": state_dim,
@@ -242,6 +465,7 @@ def main():
         "algo": "offline_cql_q_learning",
         "cql_alpha": args.cql_alpha,
         "target_tau": args.target_tau,
+        "quantization": {"int8": "dynamic_int8", "fp16": "fp16"}.get(args.quantize, "none"),
         "train_transitions": int(train_idx.numel()),
         "val_transitions": int(val_idx.numel()),
         "selection_metric": "val_total" if val_idx.numel() > 0 else "train_total",
@@ -249,6 +473,7 @@ def main():
         "state_mean": [float(x) for x in state_mean.tolist()],
         "state_std": [float(x) for x in state_std.tolist()],
     }
+    # Только stdlib: orjson записал бы best_metric=inf (ни одной эпохи) как null, а json.dumps пишет Infinity.
     meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"Saved model to {out_path}")
     print(f"Saved metadata to {meta_path}")